@@ -12,6 +12,7 @@ from word2number import w2n
 from .exceptions import FileNotUniqueError, FunctionNotFoundError, ChartNotFoundError, HypothesisError
 from .filehandler import FileHandler
 from .report import ReportGenerator
+from .resampling import Resampler
 from .statistantcalc import StatistantCalc
 
 
@@ -38,15 +39,17 @@ class Statistant(MycroftSkill):
 
         # init directory named "statistant/source_files" in home directory if it does not exists for reading files
         # init directory named "statistant/results" in home directory if it does not exists to save results
+        # init directory named "statistant/sidecars" in home directory if it does not exists for columnar sidecars
+        # init directory named "statistant/sketches" in home directory if it does not exists for quantile sketches
         # directory is for reading files
         parent_dir = os.path.expanduser("~")
-        directories = ("statistant/source_files", "statistant/results")
+        directories = ("statistant/source_files", "statistant/results", "statistant/sidecars", "statistant/sketches")
         concat_root_path = partial(os.path.join, parent_dir)
         make_directory = partial(os.makedirs, exist_ok=True)
         for path_items in map(concat_root_path, directories):
             make_directory(path_items)
 
-    def init_calculator(self, filename, func=None) -> StatistantCalc:
+    def init_calculator(self, filename, func=None, columns=None, rows=None) -> StatistantCalc:
         """
         Function for initialising StatistantCalculator.
 
@@ -56,6 +59,10 @@ class Statistant(MycroftSkill):
             is filename of file on which calculation should be performed
         func
             function which should be performed
+        columns
+            [optional] columns which are needed for the calculation. If given, only these columns are read
+        rows
+            [optional] (lower, upper) rows which are needed for the calculation. If given, only these rows are read
 
         Returns
         -------
@@ -63,9 +70,18 @@ class Statistant(MycroftSkill):
             StatistantCalculator Object
         """
         calc = None
+        # memory budget of the shared file cache can be configured in the skill settings
+        FileHandler.cache.resize(int(self.settings.get('cache_memory_mb', 1024)) * 1024 ** 2)
         try:
-            file_handler = FileHandler(filename)
-            calc = StatistantCalc(file_handler.content, filename, func)
+            # with interval indexes the whole column is read once, so every later interval is answered by the index
+            prefix_index = self.settings.get('prefix_index', False)
+            sorted_index = self.settings.get('sorted_index', False)
+            file_handler = FileHandler(filename, sidecar=self.settings.get('use_sidecars', False),
+                                       columns=columns, rows=None if prefix_index or sorted_index else rows,
+                                       stream_threshold=int(self.settings.get('stream_threshold_mb', 512)) * 1024 ** 2,
+                                       compact=self.settings.get('compact_dtypes', False))
+            # content is read by the calculator at the first access
+            calc = StatistantCalc(None, filename, func, file_handler, prefix_index, sorted_index)
         except FileNotFoundError:
             self.speak_dialog('FileNotFound.error', {'filename': filename})
         except FileNotUniqueError:
@@ -73,6 +89,28 @@ class Statistant(MycroftSkill):
 
         return calc
 
+    def run_batch(self, filename, queries):
+        """
+        Function for answering many questions on one file at once (e.g. for nightly summaries).
+        The file is read once with all needed columns and the queries are answered by StatistantCalc.run_batch
+
+        Parameters
+        ----------
+        filename
+            is filename of file on which calculation should be performed
+        queries
+            iterable of (func, col, lower, upper) or (func, col, lower, upper, value) tuples,
+            see StatistantCalc.run_batch
+
+        Returns
+        -------
+        results
+            DataFrame with one row per query or None if the file could not be found
+        """
+        queries = [(query[0], str(query[1]).lower()) + tuple(query[2:]) for query in queries]
+        calc = self.init_calculator(filename, "batch", columns=[query[1] for query in queries])
+        return None if calc is None else calc.run_batch(queries)
+
     @staticmethod
     def get_file_path(func, filename, filetype):
         """
@@ -129,9 +167,12 @@ class Statistant(MycroftSkill):
         -------
         result
             Result of statistical calculation (one value)
+        approximate_error
+            error bound of the result if it was approximated, else None
 
         """
         result = None
+        approximate_error = None
 
         filename = message.data.get('file')
         col = message.data.get('colname').lower()
@@ -143,11 +184,12 @@ class Statistant(MycroftSkill):
             upper = w2n.word_to_num(upper)
 
         try:
-            calc = self.init_calculator(filename)
+            calc = self.init_calculator(filename, columns=[col], rows=(lower, upper))
             if lower is not None and upper is not None:
                 result = calc.stats_basic(func, col, True, lower, upper)
             else:
                 result = calc.stats_basic(func, col)
+            approximate_error = calc.approximate_error
 
         except KeyError:
             self.speak_dialog('KeyError', {'colname': col, 'func': func})
@@ -156,7 +198,7 @@ class Statistant(MycroftSkill):
         except FunctionNotFoundError:
             self.speak_dialog('FunctionNotFound.error', {'func': func})
 
-        return result
+        return result, approximate_error
 
     @intent_file_handler('mean.intent')
     def handle_mean(self, message):
@@ -174,7 +216,7 @@ class Statistant(MycroftSkill):
         col = message.data.get('colname').lower()
 
         try:
-            calc = self.init_calculator(filename)
+            calc = self.init_calculator(filename, columns=[col])
 
             first_val = w2n.word_to_num(message.data.get('first'))
             sec_val = w2n.word_to_num(message.data.get('second'))
@@ -199,10 +241,54 @@ class Statistant(MycroftSkill):
             Message Bus event information from the intent parser
         """
         func = message.data.get('function')
-        result = self.handle_basic_stats(message, func)
-        if result is not None:
+        result, approximate_error = self.handle_basic_stats(message, func)
+        if result is not None and approximate_error is not None:
+            # results of big files are estimated by sketches, the error bound is spoken with them
+            if func == "mode":
+                self.speak_dialog('mode.approximate', {'result': result, 'error': approximate_error})
+            else:
+                self.speak_dialog('distinct.approximate', {'result': result,
+                                                           'error': round(approximate_error * 100, 1)})
+        elif result is not None:
             self.speak_dialog('basicstats', {'function': func, 'result': result})
 
+    @intent_file_handler('grouped.intent')
+    def handle_grouped_stats(self, message):
+        """
+        function for handling statistical basic functions per group (e.g. average of sales by region).
+        Results of up to max_spoken_groups groups are spoken, more are saved as csv in statistant/results
+
+        Parameters
+        ----------
+        message
+            Message Bus event information from the intent parser
+        """
+        func = message.data.get('function')
+        filename = message.data.get('file')
+        col = message.data.get('colname').lower()
+        group = message.data.get('group').lower()
+
+        calc = self.init_calculator(filename, func, columns=[col, group])
+        result = None
+        try:
+            if calc is not None:
+                result = calc.stats_grouped(func, col, group)
+        except KeyError as e:
+            self.speak_dialog('KeyError', {'colname': e.args[0], 'func': func})
+        except FunctionNotFoundError:
+            self.speak_dialog('FunctionNotFound.error', {'func': func})
+
+        if result is None:
+            return
+        if len(result) <= int(self.settings.get('max_spoken_groups', 10)):
+            spoken = ", ".join(f"{label} {value}" for label, value in result.items())
+            self.speak_dialog('grouped', {'function': func, 'colname': col, 'group': group, 'result': spoken})
+        else:
+            path = self.get_file_path(func, filename, "csv")
+            result.rename(func).rename_axis(group).to_csv(path)
+            self.speak_dialog('grouped.saved', {'function': func, 'colname': col, 'group': group,
+                                                'count': len(result)})
+
     @intent_file_handler('quantiles.intent')
     def handle_quantile(self, message):
         """
@@ -213,6 +299,31 @@ class Statistant(MycroftSkill):
         message
             Message Bus event information from the intent parser
         """
+        self.handle_quantiles(message)
+
+    @intent_file_handler('approximate.quantiles.intent')
+    def handle_approximate_quantile(self, message):
+        """
+        function for handling approximate quantiles. They are answered by a quantile sketch of the column
+
+        Parameters
+        ----------
+        message
+            Message Bus event information from the intent parser
+        """
+        self.handle_quantiles(message, approximate=True)
+
+    def handle_quantiles(self, message, approximate=None):
+        """
+        function for calculating and speaking a quantile
+
+        Parameters
+        ----------
+        message
+            Message Bus event information from the intent parser
+        approximate
+            [optional] True if the quantile should be approximated, None if only big files should be approximated
+        """
         func = "quantile"
         filename = message.data.get('file')
         col = message.data.get('colname').lower()
@@ -231,18 +342,21 @@ class Statistant(MycroftSkill):
             lower = w2n.word_to_num(lower)
             upper = w2n.word_to_num(upper)
 
-        calc = self.init_calculator(filename)
+        calc = self.init_calculator(filename, columns=[col], rows=(lower, upper))
         try:
             if not 0 < percentile < 1:
                 # percentile has to be between 0 and 1
                 self.speak_dialog('percentile.error')
             elif lower is not None and upper is not None:
-                result = calc.quantiles(col, percentile, True, lower, upper)
+                result = calc.quantiles(col, percentile, True, lower, upper, approximate)
             else:
-                result = calc.quantiles(col, percentile)
+                result = calc.quantiles(col, percentile, approximate=approximate)
         except KeyError:
             self.speak_dialog("KeyError", {"colname": col, "func": func})
-        if result is not None:
+        if result is not None and calc.approximate_error is not None:
+            self.speak_dialog('quantiles.approximate', {'percentile': percentile, 'quantile': result,
+                                                        'error': round(calc.approximate_error * 100, 1)})
+        elif result is not None:
             self.speak_dialog('quantiles', {'percentile': percentile, 'quantile': result})
 
     @staticmethod
@@ -291,6 +405,19 @@ class Statistant(MycroftSkill):
                 requested_adjustments.append(adjustment)
         return requested_adjustments
 
+    @intent_file_handler('cluster.auto.intent')
+    def handle_auto_cluster(self, message):
+        """
+        function for handling cluster intent without number of clusters.
+        The number of clusters is recommended by the silhouette of all candidates, which are fitted in parallel.
+
+        Parameters
+        -------
+        message
+            Message Bus event information from the intent parser
+        """
+        self.handle_cluster(message)
+
     @intent_file_handler('cluster.intent')
     def handle_cluster(self, message):
         """
@@ -306,7 +433,8 @@ class Statistant(MycroftSkill):
         # Init variables
         func = "clusteranalysis"
         filename = message.data.get('file')
-        num_clusters = w2n.word_to_num(message.data.get('num_clusters'))
+        num_clusters = message.data.get('num_clusters')
+        num_clusters = None if num_clusters is None else w2n.word_to_num(num_clusters)
 
         x_col = self.get_response('get.x-axis')
         y_col = self.get_response('get.y-axis')
@@ -316,7 +444,18 @@ class Statistant(MycroftSkill):
         y_label = None
 
         try:
-            calc = self.init_calculator(filename, func)
+            # only the clustered columns are read
+            calc = self.init_calculator(filename, func, columns=[x_col, y_col])
+
+            # without number of clusters, every candidate is fitted and the best one is recommended.
+            # the fits are cached, so changing the number of clusters afterwards does not refit
+            if num_clusters is None:
+                num_clusters = calc.recommend_num_clusters([x_col, y_col], int(self.settings.get('max_clusters', 10)),
+                                                           int(self.settings.get('cluster_workers', 0)) or None)
+                if num_clusters is None:
+                    self.speak_dialog('cluster.recommendation.error')
+                    return
+                self.speak_dialog('cluster.recommendation', {'num_clusters': num_clusters})
 
             # ask if user wants to adjust something
             want_adjustment = self.ask_yesno('want.adjustments', {'function': func, 'more': ''})
@@ -446,7 +585,7 @@ class Statistant(MycroftSkill):
                 y_col = None
 
             try:
-                calc = self.init_calculator(filename, func)
+                calc = self.init_calculator(filename, func, [col for col in (x_col, y_col) if col is not None])
 
                 # check if columns are in file
                 calc.charts(chart_type, x_col, y_col, title, x_label, y_label, x_lim, y_lim, color)
@@ -560,7 +699,7 @@ class Statistant(MycroftSkill):
         path = self.get_file_path(func, filename, "png")
 
         try:
-            calc = self.init_calculator(filename, func)
+            calc = self.init_calculator(filename, func, [col])
 
             # check if column is in file
             calc.pie_charts(col)
@@ -600,18 +739,30 @@ class Statistant(MycroftSkill):
         col = message.data.get('colname').lower()
         val = message.data.get('val')
         frequency_type = message.data.get('freq_kind')
+        lower = message.data.get('lower')
+        upper = message.data.get('upper')
 
         func = f"{frequency_type} frequency"
 
         result = None
         try:
             value = w2n.word_to_num(val)
-            calc = self.init_calculator(filename)
-            result = calc.frequency(value, col, frequency_type)
+            if lower is not None:
+                lower = w2n.word_to_num(lower)
+                upper = w2n.word_to_num(upper)
+            calc = self.init_calculator(filename, columns=[col], rows=(lower, upper))
+            if lower is not None and upper is not None:
+                result = calc.frequency(value, col, frequency_type, True, lower, upper)
+            else:
+                result = calc.frequency(value, col, frequency_type)
         except ValueError:
             self.speak_dialog("ValueError")
 
-        if result is not None:
+        if result is not None and calc.approximate_error is not None:
+            # frequencies of big files are estimated by a sketch, which never counts too low
+            error = calc.approximate_error if frequency_type == "absolute" else round(calc.approximate_error * 100, 3)
+            self.speak_dialog(f"frequency.{frequency_type}.approximate", {"result": result, "error": error})
+        elif result is not None:
             self.speak_dialog("basicstats", {"function": func, "result": result})
 
     @intent_file_handler('quartile.intent')
@@ -645,7 +796,7 @@ class Statistant(MycroftSkill):
             lower = w2n.word_to_num(lower)
             upper = w2n.word_to_num(upper)
 
-        calc = self.init_calculator(filename)
+        calc = self.init_calculator(filename, columns=[col], rows=(lower, upper))
 
         try:
             if percentile is None:
@@ -679,7 +830,7 @@ class Statistant(MycroftSkill):
 
         func = f"simple-{model_kind}-regression"
 
-        calc = self.init_calculator(filename, model_kind)
+        calc = self.init_calculator(filename, model_kind, [x_colname, y_col])
 
         model = None
         try:
@@ -714,11 +865,11 @@ class Statistant(MycroftSkill):
 
         func = f"multiple-{model_kind}-regression"
         self.speak_dialog("regression.wait", {"reg_kind": func})
-        calc = self.init_calculator(filename, model_kind)
-
-        model = None
         # prepare x data
         x_list = x_cols.split()
+        calc = self.init_calculator(filename, model_kind, x_list + [y_col])
+
+        model = None
         try:
             model = calc.multiple_regression(model_kind, x_list, y_col)
         except KeyError:
@@ -751,7 +902,7 @@ class Statistant(MycroftSkill):
         """
         hypothesis = utterance.lower()
         hypothesis_kinds = ["corresponds to the population", "are equal", "there is a difference between",
-                            "are independent"]
+                            "are independent", "has an average of", "have the same average"]
 
         valid_hypothesis = any(kind in hypothesis for kind in hypothesis_kinds)
         return valid_hypothesis
@@ -767,6 +918,10 @@ class Statistant(MycroftSkill):
         filename = self.get_response('hypothesis.file', num_retries=2)
 
         calc = self.init_calculator(filename, func)
+        if calc is None:
+            return
+        calc.resampler = Resampler(int(self.settings.get('resamples', 10000)),
+                                   max_workers=int(self.settings.get('cluster_workers', 0)) or None)
 
         answer = None
         try:
@@ -778,6 +933,40 @@ class Statistant(MycroftSkill):
         if answer is not None:
             self.speak_dialog(answer)
 
+    @intent_file_handler('hypothesis.pairs.intent')
+    def handle_pairwise_hypothesis_tests(self, message):
+        """
+        function for handling intents for testing every pair of columns of a file.
+        Significant results are shown in a report, all results are saved as csv in statistant/results
+
+        Parameters
+        ----------
+        message
+            Message Bus event information from the intent parser
+        """
+        func = "pairwisetests"
+        filename = message.data.get('file')
+        correction = self.settings.get('multiple_test_correction', 'holm')
+
+        calc = self.init_calculator(filename, func)
+        if calc is None:
+            return
+        self.speak_dialog('hypothesis.pairs.wait')
+        results = calc.hypothesis_all_pairs(correction=correction,
+                                            max_workers=int(self.settings.get('cluster_workers', 0)) or None)
+        significant = results[results["significant"]].sort_values(["test", "p_adjusted"])
+        results.to_csv(self.get_file_path(func, filename, "csv"), index=False)
+
+        # create report and open it
+        counts = results.groupby("test", sort=False)["significant"].agg(["size", "sum"])
+        description = "\n".join(f"{test}: {size} tests, {total} significant ({correction} corrected, alpha 0.05)"
+                                for test, (size, total) in counts.iterrows())
+        report_generator = ReportGenerator(func, filename)
+        report_generator.create_table_report(significant, "Pairwise hypothesis tests", description)
+        self.open_file(report_generator.output_path)
+        self.speak_dialog('hypothesis.pairs', {'count': len(results), 'significant': len(significant),
+                                               'file': filename})
+
     @intent_file_handler('percentage.change.intent')
     def handle_percentage_change(self, message):
         """
@@ -819,7 +1008,7 @@ class Statistant(MycroftSkill):
         path = self.get_file_path(func, filename, "png")
 
         try:
-            calc = self.init_calculator(filename)
+            calc = self.init_calculator(filename, columns=[col])
 
             # check if column is in file
             calc.pie_charts(col)
@@ -0,0 +1,195 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+# feature columns in the processes of ClusterModel.fit_candidates
+_worker_features = None
+
+
+def _init_worker(features):
+    global _worker_features
+    _worker_features = features
+
+
+def _fit_scored(num_clusters: int):
+    # fitted and scored model of the features (runs in the processes of ClusterModel.fit_candidates)
+    return ClusterModel.fit_scored(_worker_features, num_clusters)
+
+
+class ClusterModel:
+    """
+    This class represents a k-means model fitted on selected feature columns.
+    Rows with an empty feature are not clustered. Above minibatch_rows rows the model is fitted
+    with MiniBatchKMeans, which uses mini batches instead of the whole data in every iteration.
+
+    Attributes
+    ----------
+    columns : tuple
+        feature columns the model was fitted on
+    num_clusters : int
+        number of clusters
+    model : KMeans or MiniBatchKMeans
+        fitted estimator
+    valid : ndarray
+        bool mask of the clustered rows
+    labels : ndarray
+        cluster of every clustered row
+    centroids : ndarray
+        center of every cluster (num_clusters x columns)
+    silhouette : float
+        silhouette score on a sample of the rows, None until it is scored
+    """
+
+    # number of rows above which MiniBatchKMeans is used
+    minibatch_rows = 100000
+    # size of the mini batches of MiniBatchKMeans
+    batch_size = 4096
+    # number of rows on which the silhouette is scored (its cost grows quadratically with the rows)
+    silhouette_rows = 5000
+    # start method of the processes of fit_candidates. The skill runs threads, which must not be forked
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+    def __init__(self, features, num_clusters: int, random_state: int = 0):
+        """
+        Inits the ClusterModel and fits it.
+
+        Parameters
+        ----------
+        features
+            DataFrame with the feature columns
+        num_clusters
+            number of clusters
+        random_state
+            [optional] seed of the initialization, makes the clusters reproducible
+        """
+        self.columns = tuple(features.columns)
+        self.num_clusters = num_clusters
+        x = features.to_numpy(dtype="float64")
+        self.valid = ~np.isnan(x).any(axis=1)
+        x = x[self.valid]
+
+        if len(x) > self.minibatch_rows:
+            self.model = MiniBatchKMeans(n_clusters=num_clusters, batch_size=self.batch_size, n_init=3,
+                                         random_state=random_state)
+        else:
+            self.model = KMeans(n_clusters=num_clusters, n_init=10, random_state=random_state)
+        self.labels = self.model.fit_predict(x)
+        self.centroids = self.model.cluster_centers_
+        self.silhouette = None
+
+    @property
+    def inertia(self):
+        # sum of squared distances of the rows to their cluster center
+        return self.model.inertia_
+
+    @property
+    def nbytes(self):
+        return self.valid.nbytes + self.labels.nbytes + self.centroids.nbytes
+
+    def score(self, features, random_state: int = 0):
+        """
+        function for scoring the clusters with the silhouette of a sample of the rows.
+        The score is stored in self.silhouette
+
+        Parameters
+        ----------
+        features
+            DataFrame with the feature columns the model was fitted on
+        random_state
+            [optional] seed of the sample
+
+        Returns
+        -------
+        silhouette
+            silhouette score between -1 and 1 (higher is better), NaN if all rows are in one cluster
+        """
+        if self.silhouette is None:
+            x = features.to_numpy(dtype="float64")[self.valid]
+            if len(np.unique(self.labels)) < 2 or len(np.unique(self.labels)) >= len(x):
+                self.silhouette = np.nan
+            else:
+                self.silhouette = silhouette_score(x, self.labels, sample_size=min(self.silhouette_rows, len(x)),
+                                                   random_state=random_state)
+        return self.silhouette
+
+    @classmethod
+    def fit_scored(cls, features, num_clusters: int):
+        """
+        function for fitting and scoring a model, used by the workers of fit_candidates
+
+        Parameters
+        ----------
+        features
+            DataFrame with the feature columns
+        num_clusters
+            number of clusters
+
+        Returns
+        -------
+        model
+            fitted and scored ClusterModel
+        """
+        model = cls(features, num_clusters)
+        model.score(features)
+        return model
+
+    @classmethod
+    def fit_candidates(cls, features, candidates, max_workers: int = None):
+        """
+        function for fitting and scoring models for many numbers of clusters in parallel processes.
+        The features are sent once to every process. If the processes can not be started,
+        the models are fitted in this process
+
+        Parameters
+        ----------
+        features
+            DataFrame with the feature columns
+        candidates
+            numbers of clusters which should be fitted
+        max_workers
+            [optional] number of processes, default is the number of cores
+
+        Returns
+        -------
+        models
+            dict with the scored ClusterModel per number of clusters
+        """
+        candidates = list(candidates)
+        max_workers = min(max_workers or os.cpu_count() or 1, len(candidates))
+        if max_workers > 1:
+            context = multiprocessing.get_context(cls.start_method)
+            if cls.start_method == "forkserver":
+                # the processes are forked from a server which imported this module once
+                context.set_forkserver_preload([__name__])
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker,
+                                         initargs=(features,)) as executor:
+                    return dict(zip(candidates, executor.map(_fit_scored, candidates)))
+            except BrokenProcessPool:
+                # e.g. the processes can not import this module if the skill was loaded under another name
+                pass
+        _init_worker(features)
+        return {k: _fit_scored(k) for k in candidates}
+
+    @staticmethod
+    def recommend(models):
+        """
+        function for recommending the number of clusters with the highest silhouette
+
+        Parameters
+        ----------
+        models
+            dict with the scored ClusterModel per number of clusters
+
+        Returns
+        -------
+        num_clusters
+            recommended number of clusters, None if no model could be scored
+        """
+        scores = {k: model.silhouette for k, model in models.items() if not np.isnan(model.silhouette)}
+        return max(scores, key=scores.get) if scores else None
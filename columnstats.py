@@ -0,0 +1,909 @@
+from operator import attrgetter, methodcaller
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from scipy.sparse import coo_matrix, issparse
+
+
+class ColumnProfile:
+    """
+    This class represents the profile of a selected column. It is computed once per selection,
+    afterwards every statistical basic function, quantile and range is a lookup.
+
+    Attributes
+    ----------
+    count : int
+        number of valid (not NaN) values
+    nan_count : int
+        number of NaN values
+    total : float
+        sum of the valid values
+    mean : float
+        arithmetic average of the valid values
+    m2 : float
+        sum of squared deviations from the mean
+    sum_squares : float
+        sum of the squared valid values
+    minimum : float
+        smallest valid value
+    maximum : float
+        top valid value
+    sorted : ndarray
+        valid values sorted ascending
+    """
+
+    # functions of stats_basic which are answered by the profile
+    results = {
+        "average": attrgetter("mean"),
+        "median": methodcaller("median"),
+        "variance": attrgetter("variance"),
+        "mode": methodcaller("mode"),
+        "standard deviation": attrgetter("std"),
+        "smallest value": attrgetter("minimum"),
+        "top value": attrgetter("maximum"),
+        "sum": attrgetter("total"),
+        "quartile range": methodcaller("iqr"),
+        "range": methodcaller("data_range"),
+        "herfindahl index": methodcaller("herfindahl")
+    }
+    functions = tuple(results)
+
+    def __init__(self, values):
+        """
+        Inits the ColumnProfile.
+
+        Parameters
+        ----------
+        values
+            values of the selection as array or Series. NaN values are counted, but not profiled
+        """
+        values = np.asarray(values, dtype="float64")
+        valid = values[~np.isnan(values)]
+        self.sorted = np.sort(valid)
+        self.count = valid.size
+        self.nan_count = values.size - valid.size
+        self.total = valid.sum()
+        self.mean = self.total / self.count if self.count else np.nan
+        self.m2 = np.square(valid - self.mean).sum()
+        self.sum_squares = np.dot(valid, valid)
+        self.minimum = self.sorted[0] if self.count else np.nan
+        self.maximum = self.sorted[-1] if self.count else np.nan
+
+    @property
+    def nbytes(self):
+        # memory used by the profile, mainly the sorted values
+        return self.sorted.nbytes + 128
+
+    @property
+    def variance(self):
+        # sample variance (ddof=1) like pandas
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, percentile: float):
+        """
+        function for getting a quantile with linear interpolation like pandas/numpy
+
+        Parameters
+        ----------
+        percentile
+            percentile of quantile between 0 and 1
+
+        Returns
+        -------
+        quantile
+            value of the quantile
+        """
+        return self.quantile_sorted(self.sorted, percentile)
+
+    @staticmethod
+    def quantile_sorted(sorted_values, percentile: float):
+        """
+        function for getting a quantile of values which are already sorted ascending.
+        Uses the same interpolation as numpy's linear method, so results are identical to Series.quantile
+
+        Parameters
+        ----------
+        sorted_values
+            values sorted ascending
+        percentile
+            percentile of quantile between 0 and 1
+
+        Returns
+        -------
+        quantile
+            value of the quantile
+        """
+        n = len(sorted_values)
+        if n == 0:
+            return np.nan
+        virtual_index = (n - 1) * percentile
+        previous_index = int(np.floor(virtual_index))
+        next_index = min(previous_index + 1, n - 1)
+        gamma = virtual_index - previous_index
+        return ColumnProfile.interpolate(sorted_values[previous_index], sorted_values[next_index], gamma)
+
+    @staticmethod
+    def interpolate(a, b, gamma):
+        # linear interpolation between a and b exactly like numpy's quantile
+        diff = b - a
+        return b - diff * (1 - gamma) if gamma >= 0.5 else a + diff * gamma
+
+    def median(self):
+        n = self.count
+        if n == 0:
+            return np.nan
+        if n % 2:
+            return self.sorted[n // 2]
+        return np.mean(self.sorted[n // 2 - 1:n // 2 + 1])
+
+    def mode(self):
+        """
+        function for getting the mode(s) from the runs of equal sorted values
+
+        Returns
+        -------
+        mode
+            sorted list of all values with the highest count
+        """
+        if self.count == 0:
+            return []
+        starts = np.flatnonzero(np.r_[True, self.sorted[1:] != self.sorted[:-1]])
+        counts = np.diff(np.r_[starts, self.count])
+        return self.sorted[starts[counts == counts.max()]].tolist()
+
+    def iqr(self):
+        return self.quantile(0.75) - self.quantile(0.25)
+
+    def data_range(self):
+        return self.maximum - self.minimum
+
+    def herfindahl(self):
+        # sum of squared shares = sum of squares / squared sum
+        return self.sum_squares / self.total ** 2 if self.count else np.nan
+
+    def result(self, func: str):
+        """
+        function for getting the result of a statistical basic function
+
+        Parameters
+        ----------
+        func
+            function name. Possible function names are listed in ColumnProfile.functions
+
+        Returns
+        -------
+        result
+            value of the function
+        """
+        return self.results[func](self)
+
+
+class PrefixIndex:
+    """
+    This class represents a prefix-sum index of a column. Sum, average, variance and standard deviation
+    of any row interval are answered in constant time without copying the interval.
+    Values are shifted by the average of the column before summing, so the cumulative sums stay small
+    and variances do not suffer from cancellation.
+
+    Attributes
+    ----------
+    shift : float
+        value which is subtracted from every value before summing
+    cum_sum : ndarray
+        cumulative sum of the shifted valid values, cum_sum[i] is the sum of the first i rows
+    cum_squares : ndarray
+        cumulative sum of the squared shifted valid values
+    cum_count : ndarray
+        cumulative number of valid values
+    """
+
+    # functions of stats_basic which are answered by the prefix index
+    functions = ("sum", "average", "variance", "standard deviation")
+
+    def __init__(self, values):
+        """
+        Inits the PrefixIndex.
+
+        Parameters
+        ----------
+        values
+            values of the whole column as array or Series. NaN values are skipped
+        """
+        values = np.asarray(values, dtype="float64")
+        valid = ~np.isnan(values)
+        self.shift = values[valid].mean() if valid.any() else 0.0
+        shifted = np.where(valid, values - self.shift, 0.0)
+        self.cum_sum = np.concatenate(([0.0], np.cumsum(shifted)))
+        self.cum_squares = np.concatenate(([0.0], np.cumsum(np.square(shifted))))
+        self.cum_count = np.concatenate(([0], np.cumsum(valid)))
+
+    def __len__(self):
+        return len(self.cum_count) - 1
+
+    @property
+    def nbytes(self):
+        return self.cum_sum.nbytes + self.cum_squares.nbytes + self.cum_count.nbytes
+
+    def result(self, func: str, start: int, stop: int):
+        """
+        function for getting the result of a statistical basic function of the rows start:stop
+
+        Parameters
+        ----------
+        func
+            function name. Possible function names are listed in PrefixIndex.functions
+        start
+            position of the first row (inclusive)
+        stop
+            position of the last row (exclusive)
+
+        Returns
+        -------
+        result
+            value of the function. NaN if there are no valid values (sum is 0 like in pandas)
+        """
+        stop = max(start, stop)
+        count = self.cum_count[stop] - self.cum_count[start]
+        shifted_sum = self.cum_sum[stop] - self.cum_sum[start]
+        if func == "sum":
+            return shifted_sum + count * self.shift if count else 0.0
+        if count == 0:
+            return np.nan
+        if func == "average":
+            return self.shift + shifted_sum / count
+        if count < 2:
+            return np.nan
+        m2 = max(self.cum_squares[stop] - self.cum_squares[start] - shifted_sum ** 2 / count, 0.0)
+        variance = m2 / (count - 1)
+        return variance if func == "variance" else np.sqrt(variance)
+
+
+class MergeSortTree:
+    """
+    This class represents a merge-sort tree of a column. Every aligned block of rows is stored sorted,
+    so the k-th smallest value of any row interval is found by a binary search over the values and
+    counting in O(log n) blocks. Median, quantiles, minimum and maximum of an interval are hence
+    answered in O(log^3 n) after one O(n log^2 n) build.
+
+    Attributes
+    ----------
+    values : ndarray
+        values of the column in row order, NaN replaced by +inf
+    sorted_values : ndarray
+        all values sorted ascending (candidates of the binary search)
+    levels : dict
+        block size -> 2d array with one sorted block per row
+    cum_count : ndarray
+        cumulative number of valid (not NaN) values
+    """
+
+    # blocks smaller than leaf_size rows are not stored but sorted at query time
+    leaf_size = 32
+
+    # functions of stats_basic which are answered by the tree
+    functions = ("median", "quartile range", "smallest value", "top value", "range")
+
+    def __init__(self, values):
+        """
+        Inits the MergeSortTree.
+
+        Parameters
+        ----------
+        values
+            values of the whole column as array or Series. NaN values are skipped
+        """
+        values = np.asarray(values, dtype="float64")
+        valid = ~np.isnan(values)
+        self.values = np.where(valid, values, np.inf)
+        self.sorted_values = np.sort(self.values)
+        self.cum_count = np.concatenate(([0], np.cumsum(valid)))
+
+        n = len(values)
+        size = self.leaf_size
+        padded_size = size
+        while padded_size < n:
+            padded_size *= 2
+        padded = np.full(padded_size, np.inf)
+        padded[:n] = self.values
+
+        self.levels = {}
+        while size <= padded_size:
+            self.levels[size] = np.sort(padded.reshape(-1, size), axis=1)
+            size *= 2
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.sorted_values.nbytes + sum(level.nbytes for level in self.levels.values())
+
+    def count(self, start: int, stop: int):
+        # number of valid values of the rows start:stop
+        return self.cum_count[max(start, stop)] - self.cum_count[start]
+
+    def blocks(self, start: int, stop: int):
+        """
+        function for decomposing the rows start:stop into O(log n) sorted blocks
+
+        Parameters
+        ----------
+        start
+            position of the first row (inclusive)
+        stop
+            position of the last row (exclusive)
+
+        Returns
+        -------
+        blocks
+            list of sorted arrays which together contain exactly the values of the rows
+        """
+        blocks = []
+        rest = []
+        sizes = sorted(self.levels, reverse=True)
+        pos = start
+        while pos < stop:
+            size = next((size for size in sizes if pos % size == 0 and pos + size <= stop), None)
+            if size is None:
+                # rows before the next leaf block
+                end = min(stop, (pos // self.leaf_size + 1) * self.leaf_size)
+                rest.append(self.values[pos:end])
+                pos = end
+            else:
+                blocks.append(self.levels[size][pos // size])
+                pos += size
+        if rest:
+            blocks.append(np.sort(np.concatenate(rest)))
+        return blocks
+
+    def kth(self, blocks, k: int):
+        """
+        function for getting the k-th smallest value (starting at 0) of the decomposed rows
+
+        Parameters
+        ----------
+        blocks
+            sorted blocks of the rows (see blocks())
+        k
+            rank of the value
+
+        Returns
+        -------
+        value
+            k-th smallest value
+        """
+        low, high = 0, len(self.sorted_values) - 1
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self.sorted_values[middle]
+            if sum(np.searchsorted(block, candidate, side="right") for block in blocks) > k:
+                high = middle
+            else:
+                low = middle + 1
+        return self.sorted_values[low]
+
+    def quantile(self, start: int, stop: int, percentile: float):
+        """
+        function for getting a quantile of the rows start:stop with the interpolation of Series.quantile
+
+        Parameters
+        ----------
+        start
+            position of the first row (inclusive)
+        stop
+            position of the last row (exclusive)
+        percentile
+            percentile of quantile between 0 and 1
+
+        Returns
+        -------
+        quantile
+            value of the quantile
+        """
+        count = self.count(start, stop)
+        if count == 0:
+            return np.nan
+        blocks = self.blocks(start, stop)
+        virtual_index = (count - 1) * percentile
+        previous_index = int(np.floor(virtual_index))
+        next_index = min(previous_index + 1, count - 1)
+        return ColumnProfile.interpolate(self.kth(blocks, previous_index), self.kth(blocks, next_index),
+                                         virtual_index - previous_index)
+
+    def median(self, start: int, stop: int):
+        count = self.count(start, stop)
+        if count == 0:
+            return np.nan
+        blocks = self.blocks(start, stop)
+        if count % 2:
+            return self.kth(blocks, count // 2)
+        return np.mean([self.kth(blocks, count // 2 - 1), self.kth(blocks, count // 2)])
+
+    def result(self, func: str, start: int, stop: int):
+        """
+        function for getting the result of a statistical basic function of the rows start:stop
+
+        Parameters
+        ----------
+        func
+            function name. Possible function names are listed in MergeSortTree.functions
+        start
+            position of the first row (inclusive)
+        stop
+            position of the last row (exclusive)
+
+        Returns
+        -------
+        result
+            value of the function
+        """
+        if func == "median":
+            return self.median(start, stop)
+        if func == "quartile range":
+            return self.quantile(start, stop, 0.75) - self.quantile(start, stop, 0.25)
+        count = self.count(start, stop)
+        if count == 0:
+            return np.nan
+        blocks = self.blocks(start, stop)
+        minimum, maximum = self.kth(blocks, 0), self.kth(blocks, count - 1)
+        return {"smallest value": minimum, "top value": maximum, "range": maximum - minimum}[func]
+
+
+class GroupedProfile:
+    """
+    This class represents the profiles of a column per group. All groups are profiled in one pass:
+    the values are sorted once by group code and value, afterwards every statistic is a NumPy reduction
+    over the group segments (reduceat), so there is no Python loop over the groups.
+
+    Attributes
+    ----------
+    labels : Index
+        group labels, sorted ascending. Groups without valid values are included
+    count : ndarray
+        number of valid (not NaN) values per group
+    nan_count : ndarray
+        number of NaN values per group
+    total : ndarray
+        sum of the valid values per group
+    mean : ndarray
+        arithmetic average per group
+    m2 : ndarray
+        sum of squared deviations from the mean per group
+    sum_squares : ndarray
+        sum of the squared valid values per group
+    minimum : ndarray
+        smallest valid value per group
+    maximum : ndarray
+        top valid value per group
+    sorted : ndarray
+        valid values sorted by group and value
+    codes : ndarray
+        group code of every value of sorted
+    starts : ndarray
+        position of the first value of every group in sorted
+    """
+
+    results = {
+        "average": attrgetter("mean"),
+        "median": methodcaller("median"),
+        "variance": attrgetter("variance"),
+        "mode": methodcaller("mode"),
+        "standard deviation": attrgetter("std"),
+        "smallest value": attrgetter("minimum"),
+        "top value": attrgetter("maximum"),
+        "sum": attrgetter("total"),
+        "quartile range": methodcaller("iqr"),
+        "range": methodcaller("data_range"),
+        "herfindahl index": methodcaller("herfindahl"),
+        "gini coefficient": methodcaller("gini")
+    }
+    functions = tuple(results)
+
+    def __init__(self, values, groups):
+        """
+        Inits the GroupedProfile.
+
+        Parameters
+        ----------
+        values
+            values as array or Series. NaN values are counted, but not profiled
+        groups
+            group label of every value. Values without group (NaN) are dropped like in pandas groupby
+        """
+        codes, self.labels = pd.factorize(pd.Series(groups), sort=True)
+        values = np.asarray(values, dtype="float64")
+        n_groups = len(self.labels)
+
+        grouped = codes >= 0
+        valid = grouped & ~np.isnan(values)
+        self.nan_count = np.bincount(codes[grouped & ~valid], minlength=n_groups)
+        self.count = np.bincount(codes[valid], minlength=n_groups)
+
+        # one sort for all groups: by group, then by value
+        codes, values = codes[valid], values[valid]
+        order = np.lexsort((values, codes))
+        self.sorted = values[order]
+        self.codes = codes[order]
+        self.starts = np.r_[0, np.cumsum(self.count)[:-1]]
+
+        self.total = np.bincount(self.codes, weights=self.sorted, minlength=n_groups)
+        self.sum_squares = np.bincount(self.codes, weights=np.square(self.sorted), minlength=n_groups)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.mean = np.where(self.count > 0, self.total / self.count, np.nan)
+        deviations = self.sorted - np.repeat(self.mean, self.count)
+        self.m2 = np.bincount(self.codes, weights=np.square(deviations), minlength=n_groups)
+        self.minimum = self.at(0)
+        self.maximum = self.at(self.count - 1)
+
+    @property
+    def nbytes(self):
+        return self.sorted.nbytes + self.codes.nbytes + 10 * 8 * len(self.labels)
+
+    @property
+    def variance(self):
+        # sample variance (ddof=1) like pandas
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def at(self, positions):
+        """
+        function for getting the value at a position within every group
+
+        Parameters
+        ----------
+        positions
+            position within the sorted values of every group (array or scalar)
+
+        Returns
+        -------
+        values
+            value per group, NaN for groups without valid values
+        """
+        positions = np.broadcast_to(positions, self.count.shape)
+        empty = self.count == 0
+        index = np.where(empty, 0, self.starts + positions)
+        if self.sorted.size == 0:
+            return np.full(self.count.shape, np.nan)
+        return np.where(empty, np.nan, self.sorted[np.minimum(index, self.sorted.size - 1)])
+
+    def quantile(self, percentile: float):
+        """
+        function for getting a quantile per group with linear interpolation like pandas/numpy
+
+        Parameters
+        ----------
+        percentile
+            percentile of quantile between 0 and 1
+
+        Returns
+        -------
+        quantile
+            value of the quantile per group
+        """
+        virtual_index = np.maximum(self.count - 1, 0) * percentile
+        previous_index = np.floor(virtual_index).astype(np.int64)
+        next_index = np.minimum(previous_index + 1, np.maximum(self.count - 1, 0))
+        gamma = virtual_index - previous_index
+        a, b = self.at(previous_index), self.at(next_index)
+        diff = b - a
+        # same interpolation as ColumnProfile.interpolate
+        return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+    def median(self):
+        lower, upper = self.at((self.count - 1) // 2), self.at(self.count // 2)
+        return np.where(self.count % 2 == 1, lower, (lower + upper) / 2)
+
+    def mode(self):
+        """
+        function for getting the mode(s) per group from the runs of equal sorted values
+
+        Returns
+        -------
+        mode
+            sorted list of all values with the highest count per group
+        """
+        n = self.sorted.size
+        modes = [[] for _ in range(len(self.labels))]
+        if n == 0:
+            return modes
+        run_starts = np.flatnonzero(np.r_[True, (self.sorted[1:] != self.sorted[:-1])
+                                          | (self.codes[1:] != self.codes[:-1])])
+        run_lengths = np.diff(np.r_[run_starts, n])
+        run_codes = self.codes[run_starts]
+        longest = np.zeros(len(self.labels), dtype=np.int64)
+        np.maximum.at(longest, run_codes, run_lengths)
+        is_mode = run_lengths == longest[run_codes]
+        for code, value in zip(run_codes[is_mode].tolist(), self.sorted[run_starts[is_mode]].tolist()):
+            modes[code].append(value)
+        return modes
+
+    def iqr(self):
+        return self.quantile(0.75) - self.quantile(0.25)
+
+    def data_range(self):
+        return self.maximum - self.minimum
+
+    def herfindahl(self):
+        # sum of squared shares = sum of squares / squared sum
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 0, self.sum_squares / np.square(self.total), np.nan)
+
+    def gini(self):
+        # sum of all pairwise absolute differences per group: sum of x_i * (2i - n - 1), i is the rank in the group
+        n = np.repeat(self.count, self.count)
+        rank = np.arange(1, self.sorted.size + 1) - np.repeat(self.starts, self.count)
+        diffsum = np.bincount(self.codes, weights=self.sorted * (2 * rank - n - 1), minlength=len(self.labels))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 0, diffsum / (self.count * self.total), np.nan)
+
+    def result(self, func: str, percentile: float = None):
+        """
+        function for getting the result of a statistical basic function per group
+
+        Parameters
+        ----------
+        func
+            function name. Possible function names are listed in GroupedProfile.functions and "quantile"
+        percentile
+            [optional] percentile between 0 and 1, needed for "quantile"
+
+        Returns
+        -------
+        result
+            Series with the value of the function per group
+        """
+        if func == "quantile":
+            return pd.Series(self.quantile(percentile), index=self.labels)
+        if func == "mode":
+            return pd.Series(self.mode(), index=self.labels, dtype="object")
+        return pd.Series(self.results[func](self), index=self.labels)
+
+
+class FrequencyTable:
+    """
+    This class represents the hashed count table of a selected column. It is counted once per selection,
+    afterwards every absolute or relative frequency is a dict lookup.
+
+    Attributes
+    ----------
+    counts : dict
+        number of occurrences of every valid (not NaN) value
+    size : int
+        number of rows of the selection, including NaN values
+    nbytes : int
+        memory used by the table in bytes
+    """
+
+    def __init__(self, counts, size: int):
+        """
+        Inits the FrequencyTable.
+
+        Parameters
+        ----------
+        counts
+            Series with the number of occurrences (values) of every valid value (index), e.g. from value_counts()
+        size
+            number of rows of the selection, including NaN values
+        """
+        self.counts = dict(zip(counts.index.tolist(), counts.to_numpy(dtype="int64").tolist()))
+        self.size = size
+        self.nbytes = int(counts.memory_usage(index=True, deep=True))
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        function for counting the values of a selection
+
+        Parameters
+        ----------
+        values
+            values of the selection as Series
+
+        Returns
+        -------
+        table
+            FrequencyTable of the values
+        """
+        # categorical columns (compact dtypes) also count categories which do not occur in the selection
+        counts = values.value_counts(sort=False)
+        return cls(counts[counts > 0], len(values))
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        function for counting the values of a selection which is read in chunks
+
+        Parameters
+        ----------
+        chunks
+            iterable of Series with the values of the selection
+
+        Returns
+        -------
+        table
+            FrequencyTable of all chunks
+        """
+        counts = pd.Series(dtype="int64")
+        size = 0
+        for chunk in chunks:
+            counts = counts.add(chunk.value_counts(sort=False), fill_value=0)
+            size += len(chunk)
+        return cls(counts[counts > 0], size)
+
+    def absolute(self, val):
+        # values which do not occur have a frequency of 0
+        return self.counts.get(val, 0)
+
+    def relative(self, val):
+        return self.absolute(val) / self.size if self.size else np.nan
+
+    def mode(self):
+        """
+        function for getting the mode(s) from the counts
+
+        Returns
+        -------
+        mode
+            sorted list of all values with the highest count
+        """
+        if not self.counts:
+            return []
+        top = max(self.counts.values())
+        return sorted(value for value, count in self.counts.items() if count == top)
+
+    def items(self):
+        """
+        function for getting the distinct values with their counts
+
+        Returns
+        -------
+        values, counts
+            distinct values (sorted ascending) and their counts as arrays
+        """
+        values = sorted(self.counts)
+        return np.asarray(values), np.asarray([self.counts[value] for value in values])
+
+
+class CategoryCodes:
+    """
+    This class represents a factorized column. The values are replaced by integer codes once,
+    afterwards contingency tables with other columns are counted from the codes.
+
+    Attributes
+    ----------
+    codes : ndarray
+        code of every value, -1 for NaN values
+    categories : Index
+        distinct valid values in order of their codes
+    size : int
+        number of categories
+    nbytes : int
+        memory used by the codes in bytes
+    """
+
+    def __init__(self, values):
+        """
+        Inits the CategoryCodes.
+
+        Parameters
+        ----------
+        values
+            values as array or Series
+        """
+        codes, self.categories = pd.factorize(pd.Series(values))
+        self.codes = codes.astype(np.int64)
+        self.size = len(self.categories)
+        self.nbytes = int(self.codes.nbytes + self.categories.memory_usage(deep=True))
+
+
+class ContingencyTable:
+    """
+    This class represents the contingency table of two factorized columns. It is counted with a single bincount
+    over the combined codes of both columns. If the table would have more than max_cells cells, only the occurring
+    combinations are counted and the table is kept sparse.
+    Categories which do not occur together with a valid value of the other column are no part of the table
+    (like in pd.crosstab).
+
+    Attributes
+    ----------
+    table : ndarray or coo_matrix
+        number of rows per combination of categories
+    shape : tuple
+        number of categories of the first and of the second column
+    nbytes : int
+        memory used by the table in bytes
+    """
+
+    # number of cells up to which the table is dense
+    max_cells = 10 ** 7
+
+    def __init__(self, codes1, size1: int, codes2, size2: int):
+        """
+        Inits the ContingencyTable.
+
+        Parameters
+        ----------
+        codes1
+            codes of the first column, negative for NaN values
+        size1
+            number of categories of the first column
+        codes2
+            codes of the second column, negative for NaN values
+        size2
+            number of categories of the second column
+        """
+        valid = (codes1 >= 0) & (codes2 >= 0)
+        combined = codes1[valid].astype(np.int64) * size2 + codes2[valid]
+        if size1 * size2 <= self.max_cells:
+            table = np.bincount(combined, minlength=size1 * size2).reshape(size1, size2)
+            self.table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+            self.nbytes = self.table.nbytes
+        else:
+            cells, counts = np.unique(combined, return_counts=True)
+            rows, row_codes = np.unique(cells // size2, return_inverse=True)
+            cols, col_codes = np.unique(cells % size2, return_inverse=True)
+            self.table = coo_matrix((counts, (row_codes, col_codes)), shape=(len(rows), len(cols)))
+            self.nbytes = counts.nbytes + row_codes.nbytes + col_codes.nbytes
+            # few categories occur together with the other column (2x2 tables need Yates' correction),
+            # so the table is dense again
+            if len(rows) * len(cols) <= max(self.max_cells, 4):
+                self.table = self.table.toarray()
+                self.nbytes = self.table.nbytes
+        self.shape = self.table.shape
+
+    @classmethod
+    def from_codes(cls, codes1, codes2):
+        """
+        function for counting the contingency table of two CategoryCodes
+
+        Parameters
+        ----------
+        codes1
+            CategoryCodes of the first column
+        codes2
+            CategoryCodes of the second column
+
+        Returns
+        -------
+        table
+            ContingencyTable of both columns
+        """
+        return cls(codes1.codes, codes1.size, codes2.codes, codes2.size)
+
+    @property
+    def sparse(self):
+        return issparse(self.table)
+
+    def chi_squared(self):
+        """
+        function for performing a chi-squared test of independence like scipy's chi2_contingency
+        (with Yates' correction if there is one degree of freedom)
+
+        Returns
+        -------
+        chi, pval, dof
+            chi-squared statistic, p-value and degrees of freedom
+        """
+        if not self.sparse:
+            chi, pval, dof, expected = stats.chi2_contingency(self.table)
+            return chi, pval, dof
+
+        # sparse tables are bigger than 2x2, so there is no correction.
+        # sum of (observed - expected)^2 / expected over all cells is sum of observed^2 / expected - total
+        total = self.table.sum()
+        row_sums = np.asarray(self.table.sum(axis=1)).ravel()
+        col_sums = np.asarray(self.table.sum(axis=0)).ravel()
+        observed = self.table.data.astype("float64")
+        expected = row_sums[self.table.row] * (col_sums[self.table.col] / total)
+        chi = max(np.sum(observed / expected * observed) - total, 0.0)
+        dof = (self.shape[0] - 1) * (self.shape[1] - 1)
+        return chi, stats.chi2.sf(chi, dof), dof
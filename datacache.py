@@ -0,0 +1,215 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class DataFrameCache:
+    """
+    This class represents a shared in-process cache for parsed DataFrames.
+    Entries are keyed by the version of the source file (path, mtime, size), so a changed file
+    is never answered from a stale entry. Least recently used entries are evicted as soon as the
+    cached DataFrames exceed the memory budget.
+    Structures derived from a DataFrame (e.g. column profiles) can be stored alongside its entry,
+    they count against the memory budget and are evicted together with the DataFrame.
+
+    Attributes
+    ----------
+    max_bytes : int
+        memory budget of the cache in bytes
+    current_bytes : int
+        memory currently used by all cached DataFrames in bytes
+    hits : int
+        number of lookups which could be answered from the cache
+    misses : int
+        number of lookups which had to parse the file
+    """
+
+    def __init__(self, max_bytes: int = 1024 ** 3):
+        """
+        Inits the DataFrameCache.
+
+        Parameters
+        ----------
+        max_bytes
+            [optional] memory budget of the cache in bytes (default 1 GiB)
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def file_version(path):
+        """
+        function for getting the version of a file
+
+        Parameters
+        ----------
+        path
+            path of the file
+
+        Returns
+        -------
+        version
+            tuple of (path, mtime in ns, size in bytes)
+        """
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def get(self, key):
+        """
+        function for looking up a DataFrame. Counts a hit or a miss.
+
+        Parameters
+        ----------
+        key
+            key of the entry. The first element has to be the file version
+
+        Returns
+        -------
+        df
+            cached DataFrame or None if there is no entry for the key
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def get_derived(self, key, name):
+        """
+        function for looking up a structure derived from a cached DataFrame
+
+        Parameters
+        ----------
+        key
+            key of the DataFrame entry
+        name
+            name of the derived structure
+
+        Returns
+        -------
+        value
+            derived structure or None if there is no such structure
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            return self._entries[key][2].get(name)
+
+    def put_derived(self, key, name, value, nbytes: int = 0):
+        """
+        function for storing a structure derived from a cached DataFrame.
+        Nothing is stored if the DataFrame is not (or no longer) cached
+
+        Parameters
+        ----------
+        key
+            key of the DataFrame entry
+        name
+            name of the derived structure
+        value
+            derived structure
+        nbytes
+            [optional] memory used by the derived structure in bytes
+        """
+        with self._lock:
+            if key not in self._entries:
+                return
+            df, entry_bytes, derived = self._entries[key]
+            if name in derived:
+                return
+            derived[name] = value
+            self._entries[key] = (df, entry_bytes + nbytes, derived)
+            self._entries.move_to_end(key)
+            self.current_bytes += nbytes
+            self._evict()
+
+    def put(self, key, df):
+        """
+        function for adding a DataFrame to the cache.
+        Entries of older versions of the same file are dropped, DataFrames which are bigger than
+        the whole memory budget are not cached at all.
+
+        Parameters
+        ----------
+        key
+            key of the entry. The first element has to be the file version
+        df
+            DataFrame which should be cached
+        """
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            path = key[0][0]
+            stale = [k for k in self._entries if k[0][0] == path and k[0] != key[0]]
+            for k in stale:
+                self._remove(k)
+            if key in self._entries:
+                self._remove(key)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (df, nbytes, {})
+            self.current_bytes += nbytes
+            self._evict()
+
+    def resize(self, max_bytes: int):
+        """
+        function for changing the memory budget. Evicts entries if the new budget is smaller
+
+        Parameters
+        ----------
+        max_bytes
+            new memory budget of the cache in bytes
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """
+        function for removing all entries and resetting the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        function for getting the statistics of the cache
+
+        Returns
+        -------
+        stats
+            dict with hits, misses, number of entries, used and maximal bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def _remove(self, key):
+        df, nbytes, derived = self._entries.pop(key)
+        self.current_bytes -= nbytes
+
+    def _evict(self):
+        # evict least recently used entries until the budget is kept
+        while self.current_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
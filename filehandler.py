@@ -1,6 +1,19 @@
 import os
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from functools import partial
+
+import numpy as np
 import pandas as pd
-from .exceptions import FileNotUniqueError
+
+try:
+    import pyarrow as pa
+except ImportError:  # columnar sidecars are optional and need pyarrow
+    pa = None
+
+from .datacache import DataFrameCache
+from .sourceindex import SourceIndex
 
 
 class FileHandler:
@@ -17,11 +30,57 @@ class FileHandler:
         path of the 'statistant' directory
     type : str
         file type of the file
+    version : tuple
+        version of the file as (path, mtime, size)
+    cache_key : tuple
+        key of the file content in the shared DataFrameCache
+    content_key : tuple
+        key of the cache entry which holds the content. differs from cache_key if the content
+        was selected from a cached read of more columns or rows
+    columns : frozenset
+        lowercased names of the read columns or None if all columns are read
+    rows : tuple
+        (lower, upper) row numbers of the read rows or None if all rows are read
+    row_offset : int
+        number of rows of the file before the first row of content
+    sidecar_path : str
+        path of the columnar sidecar (Arrow IPC) of the file
+    sketch_dir : str
+        directory of the persisted sketches (quantile sketches, moments) of the file
+    compact : bool
+        True if the content is stored with compact dtypes
+    streaming : bool
+        True if the file is too big to be read at once and should be read in chunks
     content : DataFrame
-        content of the file as a DataFrame. Can be used for calculations
+        content of the file as a DataFrame. Can be used for calculations. Is read at the first access
     """
 
-    def __init__(self, filename):
+    # shared cache of parsed files for all FileHandlers
+    cache = DataFrameCache()
+
+    # file types which are parsed from text and hence are worth a columnar sidecar
+    sidecar_types = ('csv', 'txt', 'xlsx', 'json')
+
+    # file types which can be read in chunks and number of rows per chunk
+    stream_types = ('csv', 'txt')
+    chunk_rows = 500000
+
+    # maximal share of distinct values of a string column to store it as category in compact mode
+    category_share = 0.5
+
+    # positions of the empty rows per file path as (version, positions, scanned rows, complete, line offsets),
+    # shared by all FileHandlers. Only the empty_row_files most recently used files are kept
+    empty_row_index = OrderedDict()
+    empty_row_files = 64
+    _empty_row_lock = threading.Lock()
+    # bytes per block of the scan of csv and txt files for empty rows
+    scan_bytes = 4 * 1024 ** 2
+    # missing value markers of csv and txt files (pandas' default na_values)
+    na_markers = frozenset((b'', b'#N/A', b'#N/A N/A', b'#NA', b'-1.#IND', b'-1.#QNAN', b'-NaN', b'-nan', b'1.#IND',
+                            b'1.#QNAN', b'<NA>', b'N/A', b'NA', b'NULL', b'NaN', b'None', b'n/a', b'nan', b'null'))
+
+    def __init__(self, filename, sidecar: bool = False, columns=None, rows=None, stream_threshold: int = None,
+                 compact: bool = False):
         """
         Inits the FileHandler. Set the filename and gives the file
         the right filepath from the directory 'statistant'
@@ -30,6 +89,20 @@ class FileHandler:
         ----------
         filename : str
             is given name of the file
+        sidecar : bool
+            [optional] if True, the file is converted into a columnar sidecar at the first read
+            and later reads memory-map the sidecar instead of parsing the file
+        columns : list
+            [optional] names of the columns which are needed (case-insensitive).
+            If given, only these columns are read from the file
+        rows : tuple
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive) which are needed.
+            If given, only these rows are read from the file
+        stream_threshold : int
+            [optional] size in bytes above which csv/txt files are read in chunks instead of at once
+        compact : bool
+            [optional] if True, numeric columns are downcasted to the smallest lossless dtype
+            and string columns with few distinct values are stored as category
         """
 
         # init directory path for reading files
@@ -38,26 +111,108 @@ class FileHandler:
         path = os.path.join(parent_dir, directory)
         self.dir_path = path
 
-        # search for correct file because filename has no type
-        files = os.scandir(self.dir_path)
-        search_result = [file.name for file in files if
-                         file.name.split(".", 1)[0] == filename.lower() and file.is_file()]
-        files.close()
-
-        # If no result (=empty), raise FileNotFound Error
-        # if search result has more than 1 result, file cannot identified -> FileNotUnique Error
-        if not search_result:
-            raise FileNotFoundError("File not found")
-        elif len(search_result) > 1:
-            raise FileNotUniqueError("File has no unique name and hence cannot be identified")
-
-        self.filename = search_result[0]
+        # search for correct file in the index of the directory because filename has no type
+        self.filename = SourceIndex.for_directory(self.dir_path).lookup(filename)
         self.file_path = f"{self.dir_path}/{self.filename}"
 
         # init type
         self.type = self.filename.split(".", 1)[1]
 
-        # init content
+        sidecar_dir = os.path.join(parent_dir, "statistant/sidecars")
+        self.sidecar_path = os.path.join(sidecar_dir, f"{self.filename}.arrow")
+        self.sketch_dir = os.path.join(parent_dir, "statistant/sketches")
+        use_sidecar = sidecar and pa is not None and self.type in self.sidecar_types
+
+        # init projection, column names of the file are lowercased.
+        # rows in which every column of the file is empty are dropped in every read (see empty_rows),
+        # so row numbers of a projection match the whole file
+        self.columns = None if columns is None else frozenset(str(col).lower() for col in columns)
+
+        # init row range. content starts at row_offset + 1 of the file
+        self.rows = None
+        if rows is not None and None not in rows and min(rows) >= 1:
+            self.rows = (min(rows), max(rows))
+        self.row_offset = 0 if self.rows is None else self.rows[0] - 1
+
+        # init version of the file. content is read at the first access
+        self.version = self.cache.file_version(self.file_path)
+        self.compact = compact
+        self.cache_key = (self.version, self.columns, self.rows, self.compact)
+        self.content_key = self.cache_key
+        self.use_sidecar = use_sidecar
+        self._content = None
+
+        # files bigger than the stream threshold are not read at once but in chunks, if the type allows it
+        self.streaming = (stream_threshold is not None and self.type in self.stream_types
+                          and self.version[2] > stream_threshold)
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self.load()
+        return self._content
+
+    @property
+    def dtype_report(self):
+        # report of the compacted dtypes per column, None if the content is not compacted
+        return self.content.attrs.get("dtype_report")
+
+    def resolve_content_key(self):
+        """
+        function for getting the key of the cache entry which holds (or will hold) the content,
+        without reading the content
+
+        Returns
+        -------
+        key
+            cache_key or the key of a cached read of more columns or rows of the file
+        """
+        if self._content is not None or self.cache_key in self.cache:
+            return self.content_key
+        for key in [(self.version, self.columns, None, self.compact), (self.version, None, None, self.compact)]:
+            if key in self.cache:
+                return key
+        return self.cache_key
+
+    def is_cached(self):
+        """
+        function for checking if the content is available without reading the file
+
+        Returns
+        -------
+        cached
+            True if the content was already read or is in the cache
+        """
+        if self._content is not None:
+            return True
+        keys = [self.cache_key, (self.version, self.columns, None, self.compact),
+                (self.version, None, None, self.compact)]
+        return any(key in self.cache for key in keys)
+
+    def load(self):
+        """
+        function for loading the content from the cache, the sidecar or the file
+
+        Returns
+        -------
+        df : DataFrame
+            content of the file
+        """
+        # init content from cache if this version of the file was already parsed
+        df = self.cache.get(self.cache_key)
+        if df is None:
+            df = self.read_cached_superset()
+        if df is not None:
+            return df
+        self.content_key = self.cache_key
+
+        if self.use_sidecar:
+            df = self.read_sidecar(self.columns, self.rows)
+            if df is not None:
+                df = self.compact_dtypes(df) if self.compact else df
+                self.cache.put(self.cache_key, df)
+                return df
+
         # For future adding supported type: add type as key and reading function as value. no more actions to do
         type_chooser = {
             'csv': self.read_csv,
@@ -67,82 +222,756 @@ class FileHandler:
             'pkl': self.read_pickle,
             'h5': self.read_hdf
         }
-        self.content = type_chooser[self.type]()
+        if self.use_sidecar:
+            # sidecar always contains the whole file, projection and row range are selected afterwards
+            df = type_chooser[self.type]()
+            self.write_sidecar(df)
+            df = self.compact_dtypes(df) if self.compact else df
+            self.content_key = (self.version, None, None, self.compact)
+            self.cache.put(self.content_key, df)
+            df = self.slice_rows(self.project(df, self.columns), self.rows)
+        else:
+            df = type_chooser[self.type](self.columns, self.rows)
+            df = self.compact_dtypes(df) if self.compact else df
+            self.cache.put(self.cache_key, df)
+        return df
 
     def get_file_path(self):
         return self.file_path
 
-    def read_csv(self):
+    @staticmethod
+    def use_column(name, columns):
+        """
+        function for checking case-insensitive if a column of the file is needed
+
+        Parameters
+        ----------
+        name
+            name of the column in the file
+        columns
+            set of needed (lowercased) column names or None if all columns are needed
+
+        Returns
+        -------
+        needed
+            True if the column is needed
+        """
+        return columns is None or str(name).lower() in columns
+
+    def project(self, df, columns):
+        """
+        function for selecting the needed columns of a DataFrame
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame with all columns
+        columns
+            set of needed (lowercased) column names or None if all columns are needed
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame with the needed columns
+        """
+        if columns is None:
+            return df
+        return df[[name for name in df.columns if self.use_column(name, columns)]]
+
+    @classmethod
+    def compact_dtypes(cls, df):
+        """
+        function for storing a DataFrame with compact dtypes.
+        Integer columns are downcasted to the smallest signed integer dtype, float columns to float32 if no value
+        changes and string columns with a low share of distinct values are converted to category.
+        A report of the dtypes and memory per column is stored in df.attrs["dtype_report"]
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame with the dtypes of the reader
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame with compact dtypes
+        """
+        if df.columns.has_duplicates:
+            # columns can not be addressed by name
+            return df
+
+        report = {}
+        compacted = {}
+        for name in df.columns:
+            col = df[name]
+            new_col = col
+            if pd.api.types.is_bool_dtype(col):
+                pass
+            elif pd.api.types.is_integer_dtype(col):
+                # small integer dtypes wrap around in arithmetic, so differences of two columns
+                # have to be taken in float64 or int64
+                new_col = pd.to_numeric(col, downcast="integer")
+            elif pd.api.types.is_float_dtype(col):
+                downcasted = col.astype("float32")
+                if np.array_equal(downcasted.to_numpy("float64"), col.to_numpy("float64"), equal_nan=True):
+                    new_col = downcasted
+            elif pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col):
+                if len(col) and col.nunique() / len(col) <= cls.category_share:
+                    new_col = col.astype("category")
+            compacted[name] = new_col
+            report[name] = {
+                "dtype": str(col.dtype),
+                "compact_dtype": str(new_col.dtype),
+                "bytes": int(col.memory_usage(index=False, deep=True)),
+                "compact_bytes": int(new_col.memory_usage(index=False, deep=True))
+            }
+
+        df = pd.DataFrame(compacted, index=df.index)
+        df.attrs["dtype_report"] = report
+        return df
+
+    @staticmethod
+    def slice_rows(df, rows):
+        """
+        function for selecting a row range of a DataFrame
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame with all rows
+        rows
+            (lower, upper) row numbers (starting at 1, both inclusive) or None if all rows are needed
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame with the needed rows
+        """
+        if rows is None:
+            return df
+        return df.iloc[(rows[0] - 1):rows[1]]
+
+    def read_cached_superset(self):
+        """
+        function for selecting the content from an already cached read of more columns or rows of the file
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame with the needed columns and rows or None if there is no such read in the cache
+        """
+        supersets = [(self.version, self.columns, None, self.compact), (self.version, None, None, self.compact)]
+        for key in supersets:
+            if key != self.cache_key and key in self.cache:
+                df = self.cache.get(key)
+                if df is not None:
+                    self.content_key = key
+                    return self.slice_rows(self.project(df, self.columns), self.rows)
+        return None
+
+    def sidecar_source(self):
+        """
+        function for getting the source version which is stored in the sidecar metadata
+
+        Returns
+        -------
+        source
+            mtime and size of the file as bytes
+        """
+        path, mtime, size = self.version
+        return f"{mtime}:{size}".encode()
+
+    def read_sidecar(self, columns=None, rows=None):
+        """
+        function for reading the columnar sidecar of the file. The sidecar is memory-mapped,
+        so columns without missing values are not copied.
+
+        Parameters
+        ----------
+        columns
+            [optional] set of needed (lowercased) column names. If None, all columns are read
+        rows
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive). If None, all rows are read
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame of the sidecar or None if there is no valid sidecar for this version of the file
+        """
+        if not os.path.isfile(self.sidecar_path):
+            return None
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(self.sidecar_path))
+            metadata = reader.schema.metadata or {}
+            if metadata.get(b'statistant_source') != self.sidecar_source():
+                return None
+            table = reader.read_all()
+            if columns is not None:
+                index_columns = [name for name in table.column_names if name.startswith("__index_level_")]
+                table = table.select([name for name in table.column_names
+                                      if name.lower() in columns] + index_columns)
+            if rows is not None:
+                table = table.slice(rows[0] - 1, rows[1] - rows[0] + 1)
+        except (OSError, pa.ArrowException):
+            return None
+        return table.to_pandas(split_blocks=True)
+
+    def write_sidecar(self, df):
+        """
+        function for writing the DataFrame as uncompressed columnar sidecar (Arrow IPC).
+        Files which can not be converted (e.g. columns with mixed types) get no sidecar.
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame of the file
+        """
+        tmp_path = f"{self.sidecar_path}.{os.getpid()}.tmp"
+        try:
+            table = pa.Table.from_pandas(df)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b'statistant_source'] = self.sidecar_source()
+            table = table.replace_schema_metadata(metadata)
+
+            # write to a temporary file first, so a concurrent reader never sees a partial sidecar
+            os.makedirs(os.path.dirname(self.sidecar_path), exist_ok=True)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, self.sidecar_path)
+        except (OSError, pa.ArrowException):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def sketch_path(self, col: str, kind: str = "quantiles"):
+        """
+        function for getting the path of a persisted sketch (summary) of a column
+
+        Parameters
+        ----------
+        col
+            name of the column
+        kind
+            [optional] kind of the sketch, e.g. "quantiles" or "moments"
+
+        Returns
+        -------
+        path
+            path of the sketch (.npz)
+        """
+        return os.path.join(self.sketch_dir, f"{self.filename}.{col}.{kind}.npz")
+
+    def empty_rows(self, rows: int = None, nonempty: int = None):
+        """
+        function for getting the positions of the rows in which every column of the file is empty.
+        These rows are dropped in every read, so a row number means the same row regardless of which
+        columns or rows are read and whether the content comes from the cache, the sidecar or the file.
+        The file is only scanned as far as needed, the positions found are kept per version of the file
+
+        Parameters
+        ----------
+        rows
+            [optional] number of rows (counted over all rows of the file) which have to be covered
+        nonempty
+            [optional] number of non-empty rows which have to be covered. The whole file is covered if both are None
+
+        Returns
+        -------
+        positions
+            sorted array of the positions (starting at 0, counted over all rows of the file) of the empty rows
+        """
+        return self.empty_row_entry(rows, nonempty)[1]
+
+    def empty_row_entry(self, rows: int = None, nonempty: int = None):
+        """
+        function for getting the entry of empty_row_index of the file which covers the given rows (see empty_rows)
+
+        Returns
+        -------
+        entry
+            (version, positions, scanned rows, complete, line offsets) (see store_empty_rows)
+        """
+        def covered(empty, scanned, complete):
+            return complete or (rows is not None and scanned >= rows) or \
+                (nonempty is not None and scanned - empty >= nonempty)
+
+        with self._empty_row_lock:
+            entry = self.empty_row_index.get(self.file_path)
+            if entry is not None and entry[0] == self.version:
+                self.empty_row_index.move_to_end(self.file_path)
+                if covered(len(entry[1]), entry[2], entry[3]):
+                    return entry
+
+        scan = self.scan_empty_rows(self.empty_row_blocks(), covered)
+        if scan is None:
+            # a quoted value spans lines, so lines are not rows: the parsed rows are scanned instead
+            scan = self.scan_empty_rows(self.parsed_empty_row_blocks(), covered)
+        return self.store_empty_rows(*scan)
+
+    @staticmethod
+    def scan_empty_rows(blocks, covered):
+        """
+        function for collecting the positions of the empty rows from blocks of the file until enough rows are covered
+
+        Parameters
+        ----------
+        blocks
+            generator of (positions of the empty rows in the block, number of rows of the block, byte offset of the
+            block in the file) or None
+        covered
+            function of (number of empty rows, scanned rows, complete) whether enough rows are covered
+
+        Returns
+        -------
+        positions, scanned, complete, offsets
+            array of the positions, number of scanned rows, whether the whole file was scanned and
+            line offsets (see store_empty_rows). None if a block was None
+        """
+        positions, offsets, empty, scanned = [], [], 0, 0
+        complete = True
+        with closing(blocks):
+            for block in blocks:
+                if block is None:
+                    return None
+                positions.append(block[0] + scanned)
+                offsets.append((scanned, block[2]))
+                empty += len(block[0])
+                scanned += block[1]
+                if covered(empty, scanned, False):
+                    complete = False
+                    break
+        positions = np.concatenate(positions) if positions else np.zeros(0, dtype=np.int64)
+        if not offsets or any(offset is None for _, offset in offsets):
+            offsets = None
+        else:
+            offsets = np.array(offsets, dtype=np.int64).T
+        return positions, scanned, complete, offsets
+
+    def store_empty_rows(self, positions, scanned: int, complete: bool, offsets=None):
+        """
+        function for keeping the positions of the empty rows of the current version of the file.
+        Only the empty_row_files most recently used files are kept
+
+        Parameters
+        ----------
+        positions
+            array of the positions of the empty rows
+        scanned
+            number of rows (from the top of the file) which were scanned
+        complete
+            whether the whole file was scanned
+        offsets
+            [optional] positions of rows and byte offsets of their lines in a csv or txt file as 2d array.
+            None if the lines are unknown or not rows
+
+        Returns
+        -------
+        entry
+            entry of empty_row_index of the file
+        """
+        with self._empty_row_lock:
+            entry = self.empty_row_index.get(self.file_path)
+            if entry is None or entry[0] != self.version or (not entry[3] and (complete or scanned > entry[2])):
+                entry = (self.version, positions, scanned, complete, offsets)
+                self.empty_row_index[self.file_path] = entry
+            self.empty_row_index.move_to_end(self.file_path)
+            while len(self.empty_row_index) > self.empty_row_files:
+                self.empty_row_index.popitem(last=False)
+            return entry
+
+    def line_offset(self, start: int):
+        """
+        function for getting the last line of a csv or txt file before the row at position start
+        which is known from the scan for empty rows
+
+        Parameters
+        ----------
+        start
+            position of a row
+
+        Returns
+        -------
+        position, offset
+            position of the row of the line and byte offset of the line. None if a quoted value spans lines
+        """
+        offsets = self.empty_row_entry(rows=start + 1)[4]
+        if offsets is None:
+            return None
+        i = np.searchsorted(offsets[0], start, side="right") - 1
+        return int(offsets[0, i]), int(offsets[1, i])
+
+    def empty_row_blocks(self):
+        """
+        function for scanning the file for empty rows block by block.
+        The raw lines of csv and txt files are scanned without parsing: only lines consisting of separators,
+        quotes and characters of missing value markers are parsed. Other file types are read whole
+
+        Returns
+        -------
+        blocks
+            generator of (positions of the empty rows in the block, number of rows of the block, byte offset of the
+            block in the file or None). None is yielded if a quoted value of a csv or txt file spans lines
+        """
+        if self.type not in self.stream_types:
+            yield from self.parsed_empty_row_blocks()
+            return
+        # tables of bytes which can not occur in lines of missing values only and of quotes (as 0 or 1)
+        marker_bytes = set(b''.join(self.na_markers) + b',"\r\n')
+        other_table = bytes(byte not in marker_bytes for byte in range(256))
+        quote_table = bytes(byte == ord('"') for byte in range(256))
+        with open(self.file_path, "rb") as file:
+            header = file.readline()
+            if header.count(b'"') % 2:
+                yield None
+                return
+            rest, offset = b'', len(header)
+            while True:
+                block = file.read(self.scan_bytes)
+                data = rest + block
+                if block:
+                    end = data.rfind(b'\n') + 1
+                    data, rest = data[:end], data[end:]
+                elif data:
+                    # last line without line break
+                    data += b'\n'
+                if data:
+                    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+                    starts = np.r_[0, ends[:-1] + 1]
+                    if b'"' in data and np.logical_xor.reduceat(
+                            np.frombuffer(data.translate(quote_table), dtype=bool), starts).any():
+                        yield None
+                        return
+                    # lines of marker bytes only are candidates, which are checked value by value
+                    other = np.logical_or.reduceat(np.frombuffer(data.translate(other_table), dtype=bool), starts)
+                    empty = [i for i in np.flatnonzero(~other) if self.is_empty_line(data[starts[i]:ends[i]])]
+                    yield np.array(empty, dtype=np.int64), len(ends), offset
+                    offset += len(data)
+                if not block:
+                    return
+
+    def is_empty_line(self, line: bytes):
+        # whether every value of a raw csv line is a missing value marker (like in pandas' read_csv)
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        for value in line.split(b','):
+            if len(value) >= 2 and value.startswith(b'"') and value.endswith(b'"'):
+                value = value[1:-1]
+            if value not in self.na_markers:
+                return False
+        return True
+
+    def parsed_empty_row_blocks(self):
+        """
+        function for scanning the file for empty rows by reading all columns.
+        csv and txt files are read in chunks and without type conversion
+
+        Returns
+        -------
+        blocks
+            generator of (positions of the empty rows in the block, number of rows of the block, None)
+        """
+        path = self.file_path
+        if self.type in self.stream_types:
+            with pd.read_csv(path, dtype=object, skip_blank_lines=False, chunksize=self.chunk_rows) as reader:
+                for chunk in reader:
+                    yield np.flatnonzero(chunk.isna().all(axis=1).to_numpy()), len(chunk), None
+            return
+        readers = {
+            'xlsx': partial(pd.read_excel, dtype=object),
+            'json': pd.read_json,
+            'pkl': pd.read_pickle,
+            'h5': pd.read_hdf
+        }
+        df = readers[self.type](path)
+        yield np.flatnonzero(df.isna().all(axis=1).to_numpy()), len(df), None
+
+    def file_positions(self, rows):
+        """
+        function for mapping row numbers to positions in the file. Row numbers count the rows without the empty rows
+        (like the rows of a full read), positions count all rows of the file
+
+        Parameters
+        ----------
+        rows
+            (lower, upper) row numbers (starting at 1, both inclusive)
+
+        Returns
+        -------
+        start, stop
+            positions (starting at 0, both inclusive) of the first and last row in the file
+        """
+        empty = self.empty_rows(nonempty=rows[1])
+        # number of non-empty rows before every empty row
+        before = empty - np.arange(len(empty))
+        start, stop = (int(row - 1 + np.searchsorted(before, row - 1, side="right")) for row in rows)
+        return start, stop
+
+    def drop_empty_rows(self, df):
+        """
+        function for dropping the empty rows of a full read of the file. Except for csv and txt files
+        (which are scanned cheaply) their positions are kept, so reads of fewer columns or rows do not have to read
+        the whole file again
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame with all columns and rows of the file
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame without the rows in which every column is empty
+        """
+        empty = df.isna().all(axis=1).to_numpy()
+        # lines of csv and txt files are only known to be rows by a scan of the file
+        if self.type not in self.stream_types:
+            self.store_empty_rows(np.flatnonzero(empty), len(df), True)
+        return df[~empty]
+
+    def drop_empty_positions(self, df, start: int = 0):
+        """
+        function for dropping the empty rows of the file from a read of fewer columns or rows.
+        Only rows which are empty in the read columns can be empty rows of the file, so the file is only scanned
+        if there are such rows (and only up to the last of them). Other rows which are only empty in the read
+        columns are kept, like in a full read
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame with consecutive rows of the file
+        start
+            [optional] position of the first row of df in the file
+
+        Returns
+        -------
+        df : DataFrame
+            DataFrame without the rows in which every column of the file is empty
+        """
+        candidates = np.flatnonzero(df.isna().all(axis=1).to_numpy())
+        if len(candidates) == 0:
+            return df
+        empty = self.empty_rows(rows=start + int(candidates[-1]) + 1) - start
+        empty = empty[np.isin(empty, candidates)]
+        if len(empty) == 0:
+            return df
+        keep = np.ones(len(df), dtype=bool)
+        keep[empty] = False
+        return df.iloc[keep]
+
+    def read_csv_chunks(self, chunk_rows: int = None):
+        """
+        function for reading the needed columns and rows of the file as csv in chunks
+
+        Parameters
+        ----------
+        chunk_rows
+            [optional] number of rows per chunk. Defaults to FileHandler.chunk_rows
+
+        Returns
+        -------
+        chunks
+            generator of DataFrames with at most chunk_rows rows
+        """
+        path = self.file_path
+        columns, rows = self.columns, self.rows
+        usecols = None if columns is None else partial(self.use_column, columns=columns)
+        if rows is None:
+            position = 0
+            chunks = pd.read_csv(path, usecols=usecols, skip_blank_lines=False, chunksize=chunk_rows or self.chunk_rows)
+        else:
+            position, stop = self.file_positions(rows)
+            chunks = self.read_csv_rows(position, stop - position + 1, chunk_rows or self.chunk_rows, usecols)
+        with closing(chunks):
+            for chunk in chunks:
+                size = len(chunk)
+                if columns is None:
+                    chunk = chunk.dropna(how="all")
+                else:
+                    chunk = self.drop_empty_positions(chunk, position)
+                position += size
+                chunk.columns = chunk.columns.str.lower()
+                yield chunk
+
+    def read_csv_rows(self, start: int, nrows: int, chunk_rows: int = None, usecols=None):
+        """
+        function for reading consecutive rows of the file as csv. Reading starts at the last line before the first row
+        which is known from the scan for empty rows, so at most a block of the scan is parsed in vain
+        (unless a quoted value spans lines, then all rows before the first row are parsed)
+
+        Parameters
+        ----------
+        start
+            position of the first row
+        nrows
+            number of rows
+        chunk_rows
+            [optional] number of rows per chunk. All rows are read in one chunk if None
+        usecols
+            [optional] columns to read (like in read_csv)
+
+        Returns
+        -------
+        chunks
+            generator of DataFrames with the positions of the rows as index
+        """
+        line = self.line_offset(start)
+        with open(self.file_path, "rb") as file:
+            if line is None:
+                position, kwargs = 0, {}
+            else:
+                position, offset = line
+                kwargs = dict(header=None, names=pd.read_csv(file, nrows=0, skip_blank_lines=False).columns)
+                file.seek(offset)
+            nrows += start - position
+            with pd.read_csv(file, usecols=usecols, skip_blank_lines=False, nrows=nrows,
+                             chunksize=chunk_rows or max(nrows, 1), **kwargs) as reader:
+                chunk = None
+                for chunk in reader:
+                    chunk.index = pd.RangeIndex(position, position + len(chunk))
+                    position += len(chunk)
+                    if position > start:
+                        yield chunk.iloc[max(start - chunk.index[0], 0):]
+                if position <= start and chunk is not None:
+                    # the file ends before start, an empty chunk keeps the columns
+                    yield chunk.iloc[:0]
+
+    def read_csv(self, columns=None, rows=None):
         """
         function for reading the file as csv
 
+        Parameters
+        ----------
+        columns
+            [optional] set of needed (lowercased) column names. Other columns are not parsed
+        rows
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive). Other rows are not parsed
+
         Returns
         -------
         df : DataFrame
             DataFrame of reading result
         """
         path = self.file_path
-        df = pd.read_csv(path)
-        df.dropna(how="all", inplace=True)
+        usecols = None if columns is None else partial(self.use_column, columns=columns)
+        if columns is None and rows is None:
+            df = self.drop_empty_rows(pd.read_csv(path, skip_blank_lines=False))
+        elif rows is None:
+            df = self.drop_empty_positions(pd.read_csv(path, usecols=usecols, skip_blank_lines=False))
+        else:
+            # rows are pushed down as positions, so empty rows before and within the range are skipped like in a
+            # full read
+            start, stop = self.file_positions(rows)
+            df = next(self.read_csv_rows(start, stop - start + 1, usecols=usecols))
+            df = self.drop_empty_positions(df, start)
         df.columns = df.columns.str.lower()
         return df
 
-    def read_xlsx(self):
+    def read_xlsx(self, columns=None, rows=None):
         """
         function for reading the file as xlsx
 
+        Parameters
+        ----------
+        columns
+            [optional] set of needed (lowercased) column names. Other columns are not parsed
+        rows
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive). Other rows are not parsed
+
         Returns
         -------
         df : DataFrame
             DataFrame of reading result
         """
         path = self.file_path
-        df = pd.read_excel(path)
-        df.dropna(how="all", inplace=True)
+        usecols = None if columns is None else partial(self.use_column, columns=columns)
+        if columns is None and rows is None:
+            df = self.drop_empty_rows(pd.read_excel(path))
+        elif rows is None:
+            df = self.drop_empty_positions(pd.read_excel(path, usecols=usecols))
+        else:
+            start, stop = self.file_positions(rows)
+            df = pd.read_excel(path, usecols=usecols, skiprows=range(1, start + 1), nrows=stop - start + 1)
+            df.index += start
+            df = self.drop_empty_positions(df, start)
         df.columns = df.columns.str.lower()
         return df
 
-    def read_json(self):
+    def read_json(self, columns=None, rows=None):
         """
         function for reading the file as json
 
+        Parameters
+        ----------
+        columns
+            [optional] set of needed (lowercased) column names
+        rows
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive)
+
         Returns
         -------
         df : DataFrame
             DataFrame of reading result
         """
         path = self.file_path
-        df = pd.read_json(path)
-        df.dropna(how="all", inplace=True)
+        df = self.slice_rows(self.project(self.drop_empty_rows(pd.read_json(path)), columns), rows)
         df.columns = df.columns.str.lower()
         return df
 
-    def read_pickle(self):
+    def read_pickle(self, columns=None, rows=None):
         """
         function for reading the file as pickle
 
+        Parameters
+        ----------
+        columns
+            [optional] set of needed (lowercased) column names
+        rows
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive)
+
         Returns
         -------
         df : DataFrame
             DataFrame of reading result
         """
         path = self.file_path
-        df = pd.read_pickle(path)
-        df.dropna(how="all", inplace=True)
+        df = self.slice_rows(self.project(self.drop_empty_rows(pd.read_pickle(path)), columns), rows)
         df.columns = df.columns.str.lower()
         return df
 
-    def read_hdf(self):
+    def read_hdf(self, columns=None, rows=None):
         """
         function for reading the file as h5
 
+        Parameters
+        ----------
+        columns
+            [optional] set of needed (lowercased) column names.
+            Other columns are not read if the file is stored in table format
+        rows
+            [optional] (lower, upper) row numbers (starting at 1, both inclusive). Other rows are not read
+
         Returns
         -------
         df : DataFrame
             DataFrame of reading result
         """
         path = self.file_path
-        df = pd.read_hdf(path)
-        df.dropna(how="all", inplace=True)
+        if columns is None and rows is None:
+            df = self.drop_empty_rows(pd.read_hdf(path))
+        else:
+            start, stop = (None, None) if rows is None else self.file_positions(rows)
+            stop = None if stop is None else stop + 1
+            with pd.HDFStore(path, mode="r") as store:
+                # like read_hdf, a file with more than one dataset can not be read without a key
+                if len(store.keys()) != 1:
+                    raise ValueError("key must be provided when HDF5 file contains multiple datasets.")
+                key = store.keys()[0]
+                storer = store.get_storer(key)
+                if storer.is_table and columns is not None:
+                    names = [name for name in storer.non_index_axes[0][1] if self.use_column(name, columns)]
+                    df = store.select(key, columns=names, start=start, stop=stop)
+                else:
+                    df = self.project(store.select(key, start=start, stop=stop), columns)
+            df = self.drop_empty_positions(df, start or 0)
         df.columns = df.columns.str.lower()
         return df
@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from statsmodels.stats.multitest import multipletests
+
+from .columnstats import ContingencyTable
+
+# columns of the result tables of all pairwise tests
+result_columns = ["test", "column1", "column2", "statistic", "pvalue"]
+
+# codes of the categorical columns in the processes of chi_squared_pairs
+_worker_codes = None
+
+
+def pair_indices(n: int):
+    # indices (i, j) with i < j of all pairs of n columns
+    return np.triu_indices(n, k=1)
+
+
+def welch_pairs(df):
+    """
+    function for performing a Welch t-test for every pair of numerical columns.
+    Only count, mean and variance of every column are needed, so all pairs are calculated at once from vectors
+
+    Parameters
+    ----------
+    df
+        DataFrame with numerical columns
+
+    Returns
+    -------
+    results
+        DataFrame with test, column1, column2, statistic and pvalue per pair
+    """
+    x = df.to_numpy(dtype="float64")
+    n = np.sum(~np.isnan(x), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nanmean(x, axis=0)
+        var = np.nanvar(x, axis=0, ddof=1)
+    i, j = pair_indices(x.shape[1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se_i, se_j = var[i] / n[i], var[j] / n[j]
+        tscore = (mean[i] - mean[j]) / np.sqrt(se_i + se_j)
+        # Welch-Satterthwaite degrees of freedom
+        dof = (se_i + se_j) ** 2 / (se_i ** 2 / (n[i] - 1) + se_j ** 2 / (n[j] - 1))
+    pval = 2 * stats.t.sf(np.abs(tscore), dof)
+    return pd.DataFrame({"test": "welch", "column1": df.columns[i], "column2": df.columns[j],
+                         "statistic": tscore, "pvalue": pval}, columns=result_columns)
+
+
+def paired_pairs(df):
+    """
+    function for performing a paired t-test for every pair of numerical columns.
+    Count, sum and sum of squares of the differences of all pairs (rows where both values are valid) are
+    taken from matrix products of the centered values and the masks of valid values
+
+    Parameters
+    ----------
+    df
+        DataFrame with numerical columns
+
+    Returns
+    -------
+    results
+        DataFrame with test, column1, column2, statistic and pvalue per pair
+    """
+    x = df.to_numpy(dtype="float64")
+    valid = ~np.isnan(x)
+    with np.errstate(invalid="ignore"):
+        center = np.nan_to_num(np.nanmean(x, axis=0))
+    # centered, so the sums of squares do not cancel out
+    x = np.where(valid, x - center, 0.0)
+    mask = valid.astype("float64")
+
+    count = mask.T @ mask
+    sums = x.T @ mask - mask.T @ x
+    squares = np.square(x)
+    sum_squares = squares.T @ mask - 2 * (x.T @ x) + mask.T @ squares
+
+    i, j = pair_indices(x.shape[1])
+    n, total, total_squares = count[i, j], sums[i, j], sum_squares[i, j]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / n
+        var = np.maximum(total_squares - total * mean, 0) / (n - 1)
+        # mean of the differences of the original values
+        tscore = (mean + center[i] - center[j]) / np.sqrt(var / n)
+    pval = 2 * stats.t.sf(np.abs(tscore), n - 1)
+    return pd.DataFrame({"test": "paired", "column1": df.columns[i], "column2": df.columns[j],
+                         "statistic": tscore, "pvalue": pval}, columns=result_columns)
+
+
+def _init_worker(codes):
+    global _worker_codes
+    _worker_codes = codes
+
+
+def _chi_squared_rows(args):
+    # chi-squared tests of column i with every column of js (runs in the processes of chi_squared_pairs)
+    i, js, sizes = args
+    results = []
+    for j in js:
+        table = ContingencyTable(_worker_codes[:, i], sizes[i], _worker_codes[:, j], sizes[j])
+        if min(table.shape) < 2:
+            results.append((i, j, np.nan, np.nan))
+            continue
+        chi, pval, dof = table.chi_squared()
+        results.append((i, j, chi, pval))
+    return results
+
+
+def chi_squared_pairs(df, max_workers: int = None):
+    """
+    function for performing a chi-squared test of independence for every pair of categorical columns.
+    Columns are factorized once, the contingency tables are counted with bincount in parallel processes
+
+    Parameters
+    ----------
+    df
+        DataFrame with categorical columns
+    max_workers
+        [optional] number of processes, default is the number of cores
+
+    Returns
+    -------
+    results
+        DataFrame with test, column1, column2, statistic and pvalue per pair
+    """
+    if df.shape[1] < 2:
+        return pd.DataFrame(columns=result_columns)
+    factorized = [pd.factorize(df[col]) for col in df.columns]
+    codes = np.column_stack([col_codes for col_codes, uniques in factorized]).astype(np.int64)
+    sizes = [max(len(uniques), 1) for col_codes, uniques in factorized]
+    tasks = [(i, list(range(i + 1, df.shape[1])), sizes) for i in range(df.shape[1] - 1)]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if max_workers <= 1:
+        _init_worker(codes)
+        rows = [row for task in tasks for row in _chi_squared_rows(task)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(codes,)) as executor:
+            rows = [row for result in executor.map(_chi_squared_rows, tasks) for row in result]
+
+    i, j, chi, pval = (np.array(values) for values in zip(*rows))
+    return pd.DataFrame({"test": "chi-squared", "column1": df.columns[i.astype(int)],
+                         "column2": df.columns[j.astype(int)], "statistic": chi, "pvalue": pval},
+                        columns=result_columns)
+
+
+def correct(pvalues, method: str = "holm"):
+    """
+    function for correcting p-values for multiple comparisons. NaN p-values are ignored
+
+    Parameters
+    ----------
+    pvalues
+        p-values of all tests of a family
+    method
+        [optional] "holm" (family-wise error rate) or "bh" (Benjamini-Hochberg, false discovery rate)
+
+    Returns
+    -------
+    adjusted
+        adjusted p-values, NaN where the p-value is NaN
+    """
+    pvalues = np.asarray(pvalues, dtype="float64")
+    adjusted = np.full(pvalues.shape, np.nan)
+    valid = ~np.isnan(pvalues)
+    if valid.any():
+        adjusted[valid] = multipletests(pvalues[valid], method={"holm": "holm", "bh": "fdr_bh"}[method])[1]
+    return adjusted
@@ -0,0 +1,285 @@
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from scipy.linalg import solve_triangular
+from statsmodels.iolib.summary import Summary
+
+
+class StreamingOLS:
+    """
+    This class represents an ordinary least squares regression (with intercept) of data which is read in chunks.
+    Only the triangular factor R of the QR decomposition of [1, X, y] is kept: R'R is X'X, X'y and y'y,
+    and R is merged chunk by chunk by a QR decomposition of the stacked factors. This is as stable as a QR
+    decomposition of all rows, while memory usage only depends on the number of columns.
+    Coefficients, standard errors, R² and the F-statistic are the same as of statsmodels' OLS.
+
+    Attributes
+    ----------
+    x_names : list
+        names of the regressors
+    y_name : str
+        name of the dependent variable
+    nobs : int
+        number of rows without NaN values
+    """
+
+    def __init__(self, x_names, y_name: str):
+        """
+        Inits the StreamingOLS.
+
+        Parameters
+        ----------
+        x_names
+            names of the regressors
+        y_name
+            name of the dependent variable
+        """
+        self.x_names = list(x_names)
+        self.y_name = y_name
+        self.nobs = 0
+        # R of [1, X, y], the last column is Q'y
+        self._r = np.zeros((0, len(self.x_names) + 2))
+
+    @property
+    def exog_names(self):
+        return ["Intercept"] + self.x_names
+
+    def update(self, x, y):
+        """
+        function for adding a chunk of rows. Rows with NaN values are dropped like in statsmodels' formulas
+
+        Parameters
+        ----------
+        x
+            values of the regressors as 2d array or DataFrame
+        y
+            values of the dependent variable as array or Series
+        """
+        x = np.asarray(x, dtype="float64").reshape(len(y), len(self.x_names))
+        y = np.asarray(y, dtype="float64")
+        rows = np.column_stack((np.ones(len(y)), x, y))
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        if len(rows) == 0:
+            return
+        self.nobs += len(rows)
+        self._merge_r(rows)
+
+    def merge(self, other):
+        """
+        function for merging the regression of other rows
+
+        Parameters
+        ----------
+        other
+            StreamingOLS of the other rows (same columns)
+        """
+        if other.nobs == 0:
+            return
+        self.nobs += other.nobs
+        self._merge_r(other._r)
+
+    def _merge_r(self, rows):
+        r = np.linalg.qr(np.vstack((self._r, rows)), mode="r")
+        # keep R square, so merged factors stay small while there are less rows than columns
+        self._r = r[:self._r.shape[1]]
+
+    @property
+    def df_model(self):
+        return len(self.x_names)
+
+    @property
+    def df_resid(self):
+        return self.nobs - len(self.exog_names)
+
+    @property
+    def params(self):
+        p = len(self.exog_names)
+        return solve_triangular(self._r[:p, :p], self._r[:p, p])
+
+    @property
+    def ssr(self):
+        # sum of squared residuals
+        p = len(self.exog_names)
+        return float(np.sum(np.square(self._r[p:, p])))
+
+    @property
+    def centered_tss(self):
+        # sum of squared residuals of the model with the intercept only
+        p = len(self.exog_names)
+        return float(np.sum(np.square(self._r[1:, p])))
+
+    @property
+    def ess(self):
+        return self.centered_tss - self.ssr
+
+    @property
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    def cov_params(self):
+        """
+        function for getting the covariance matrix of the coefficients, scale * (X'X)^-1
+
+        Returns
+        -------
+        cov
+            covariance matrix as 2d array
+        """
+        p = len(self.exog_names)
+        r_inv = solve_triangular(self._r[:p, :p], np.eye(p))
+        return self.scale * r_inv @ r_inv.T
+
+    @property
+    def bse(self):
+        return np.sqrt(np.diag(self.cov_params()))
+
+    @property
+    def tvalues(self):
+        return self.params / self.bse
+
+    @property
+    def pvalues(self):
+        return 2 * stats.t.sf(np.abs(self.tvalues), self.df_resid)
+
+    def conf_int(self, alpha: float = 0.05):
+        """
+        function for getting the confidence intervals of the coefficients
+
+        Parameters
+        ----------
+        alpha
+            [optional] significance level
+
+        Returns
+        -------
+        conf_int
+            2d array with lower and upper bound per coefficient
+        """
+        q = stats.t.ppf(1 - alpha / 2, self.df_resid)
+        return np.column_stack((self.params - q * self.bse, self.params + q * self.bse))
+
+    @property
+    def rsquared(self):
+        return 1 - self.ssr / self.centered_tss
+
+    @property
+    def rsquared_adj(self):
+        return 1 - (self.nobs - 1) / self.df_resid * (1 - self.rsquared)
+
+    @property
+    def fvalue(self):
+        return (self.ess / self.df_model) / self.scale
+
+    @property
+    def f_pvalue(self):
+        return stats.f.sf(self.fvalue, self.df_model, self.df_resid)
+
+    @property
+    def llf(self):
+        return -self.nobs / 2 * (np.log(2 * np.pi) + np.log(self.ssr / self.nobs) + 1)
+
+    @property
+    def aic(self):
+        return -2 * self.llf + 2 * len(self.exog_names)
+
+    @property
+    def bic(self):
+        return -2 * self.llf + np.log(self.nobs) * len(self.exog_names)
+
+    def summary(self, alpha: float = 0.05):
+        """
+        function for summarizing the regression like statsmodels' OLS results.
+        Residual diagnostics (e.g. Durbin-Watson) need all residuals, so they are not part of the summary
+
+        Parameters
+        ----------
+        alpha
+            [optional] significance level of the confidence intervals
+
+        Returns
+        -------
+        summary
+            statsmodels Summary
+        """
+        time_now = time.localtime()
+        left = [("Dep. Variable:", [self.y_name]), ("Model:", ["OLS (streamed)"]), ("Method:", ["Least Squares"]),
+                ("Date:", [time.strftime("%a, %d %b %Y", time_now)]), ("Time:", [time.strftime("%H:%M:%S", time_now)]),
+                ("No. Observations:", [str(self.nobs)]), ("Df Residuals:", [str(self.df_resid)]),
+                ("Df Model:", [str(self.df_model)])]
+        right = [("R-squared:", [f"{self.rsquared:#8.3f}"]), ("Adj. R-squared:", [f"{self.rsquared_adj:#8.3f}"]),
+                 ("F-statistic:", [f"{self.fvalue:#8.4g}"]), ("Prob (F-statistic):", [f"{self.f_pvalue:#6.3g}"]),
+                 ("Log-Likelihood:", [f"{self.llf:#8.5g}"]), ("AIC:", [f"{self.aic:#8.4g}"]),
+                 ("BIC:", [f"{self.bic:#8.4g}"])]
+
+        summary = Summary()
+        summary.add_table_2cols(self, gleft=left, gright=right, yname=self.y_name, xname=self.exog_names,
+                                title="OLS Regression Results")
+        summary.add_table_params(self, yname=self.y_name, xname=self.exog_names, alpha=alpha, use_t=True)
+        return summary
+
+
+class DesignMatrix:
+    """
+    This class represents the design matrix of a regression, built directly from columns of a DataFrame
+    without parsing a formula. Numerical columns are written once into a contiguous matrix with an intercept,
+    other columns are dummy coded (first level dropped) like in patsy. Rows with NaN values are dropped.
+    Column names are kept as labels, so they may contain spaces or symbols.
+
+    Attributes
+    ----------
+    endog : Series
+        values of the dependent variable
+    exog : DataFrame
+        design matrix with the columns Intercept and the regressors
+    nbytes : int
+        memory used by the matrices in bytes
+    """
+
+    def __init__(self, df, x_cols, y_col: str, dtype="float64"):
+        """
+        Inits the DesignMatrix.
+
+        Parameters
+        ----------
+        df
+            DataFrame with the columns
+        x_cols
+            column names of the regressors
+        y_col
+            column name of the dependent variable
+        dtype
+            [optional] dtype of the matrix (float64 or float32)
+        """
+        missing = [col for col in list(x_cols) + [y_col] if col not in df.columns]
+        if missing:
+            raise KeyError(f"columns {missing} do not exist")
+
+        # columns (as arrays) and labels of the design matrix
+        columns, labels = [None], ["Intercept"]
+        for col in x_cols:
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                columns.append(values.to_numpy())
+                labels.append(col)
+                continue
+            codes, levels = pd.factorize(values, sort=True)
+            for code, level in enumerate(levels[1:], start=1):
+                columns.append(np.where(codes < 0, np.nan, codes == code))
+                labels.append(f"{col}[T.{level}]")
+
+        y = df[y_col].to_numpy(dtype="float64")
+        valid = ~np.isnan(y)
+        for values in columns[1:]:
+            valid &= ~pd.isna(values)
+        rows = np.flatnonzero(valid) if not valid.all() else None
+
+        matrix = np.empty((int(valid.sum()), len(columns)), dtype=dtype, order="F")
+        matrix[:, 0] = 1
+        for i, values in enumerate(columns[1:], start=1):
+            matrix[:, i] = values if rows is None else values[rows]
+        index = df.index if rows is None else df.index[rows]
+        self.exog = pd.DataFrame(matrix, index=index, columns=labels, copy=False)
+        self.endog = pd.Series(y if rows is None else y[rows], index=index, name=y_col)
+        self.nbytes = matrix.nbytes + self.endog.nbytes
@@ -9,6 +9,8 @@ from reportlab.lib.units import cm, mm
 from reportlab.pdfgen import canvas
 from svglib.svglib import svg2rlg
 
+from .regression import StreamingOLS
+
 
 class ReportGenerator:
     """
@@ -65,7 +67,9 @@ class ReportGenerator:
         self.draw_page_number(page_number)
         c.showPage()
 
-        # generate each regression plot per page
+        # generate each regression plot per page. streamed regressions keep no rows for plots
+        if isinstance(model, StreamingOLS):
+            x_col = []
         for page, x in enumerate(x_col):
             # plot regression
             fig = plt.figure(figsize=(6, 5))
@@ -87,6 +91,53 @@ class ReportGenerator:
 
         c.save()
 
+    def create_table_report(self, table, title: str, description: str = None, lines_per_page: int = 60):
+        """
+        function for creating a report of a table (e.g. results of all pairwise hypothesis tests)
+
+        Parameters
+        ----------
+        table
+            DataFrame which should be printed
+        title
+            title of the report
+        description
+            [optional] description below the title (e.g. a summary of the table)
+        lines_per_page
+            [optional] number of table lines per page
+        """
+        c = self.c
+
+        # draw title
+        c.setFont('Helvetica-Bold', 20)
+        c.setTitle(title)
+        c.drawString(cm, 750, title)
+
+        # draw description
+        c.setFont('Helvetica', 11)
+        c.drawString(cm, 720, "Generated by Mycroft Statistant-Skill.")
+        text_object = c.beginText(cm, 700)
+        for line in (description or "").splitlines():
+            text_object.textLine(line)
+        c.drawText(text_object)
+
+        # table lines, the header is repeated on every page
+        header, *rows = table.to_string(index=False, float_format=lambda value: f"{value:.4g}").splitlines()
+        first_page_lines = lines_per_page - 5 - len((description or "").splitlines())
+        pages = [rows[:first_page_lines]] + [rows[start:start + lines_per_page]
+                                             for start in range(first_page_lines, len(rows), lines_per_page)]
+        for page_number, page_rows in enumerate(pages, start=1):
+            top = 700 - 14 * (len((description or "").splitlines()) + 1) if page_number == 1 else 780
+            text_object = c.beginText(cm, top)
+            text_object.setFont('Courier', 8)
+            for line in [header] + page_rows:
+                text_object.textLine(line)
+            c.drawText(text_object)
+            self.draw_page_number(page_number)
+            c.showPage()
+
+        c.save()
+
     def draw_page_number(self, page_count):
         self.c.setFont("Helvetica", 9)
         self.c.drawRightString(200 * mm, 20 * mm,
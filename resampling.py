@@ -0,0 +1,202 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# data of the resampled columns in the processes of Resampler
+_worker_data = None
+
+
+def _init_worker(data):
+    global _worker_data
+    _worker_data = data
+
+
+def _bootstrap_batch(args):
+    # means of a batch of bootstrap resamples (runs in the processes of Resampler)
+    seed, size = args
+    rng = np.random.default_rng(seed)
+    data = _worker_data
+    n = data["n"]
+    if "values" in data:
+        index = rng.integers(0, n, size=(size, n), dtype=np.int32 if n < 2 ** 31 else np.int64)
+        return data["values"][index].mean(axis=1)
+    # number of draws from every bin, the draws within a bin are summed by their mean and variance
+    counts = rng.multinomial(n, data["weights"], size=size)
+    sums = counts @ data["means"] + rng.standard_normal(size) * np.sqrt(counts @ data["variances"])
+    return sums / n
+
+
+def _permutation_batch(args):
+    # differences of the means of two groups for a batch of permutations (runs in the processes of Resampler)
+    seed, size = args
+    rng = np.random.default_rng(seed)
+    data = _worker_data
+    n1, n2 = data["n1"], data["n2"]
+    if "values" in data:
+        pooled = np.tile(data["values"], (size, 1))
+        rng.permuted(pooled, axis=1, out=pooled)
+        sums = pooled[:, :n1].sum(axis=1)
+    else:
+        # number of values of the first group from every bin (drawn without replacement)
+        counts = rng.multivariate_hypergeometric(data["counts"], n1, size=size, method="marginals")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            finite = np.where(data["counts"] > 1, (data["counts"] - counts) / (data["counts"] - 1), 0.0)
+        variance = np.sum(counts * data["variances"] * finite, axis=1)
+        sums = counts @ data["means"] + rng.standard_normal(size) * np.sqrt(variance)
+    return sums / n1 - (data["total"] - sums) / n2
+
+
+class Resampler:
+    """
+    This class represents bootstrap and permutation resampling of means.
+    Resamples are drawn in batches of NumPy matrices, which are sized to a memory budget and spread over processes.
+    Every batch has its own seed spawned from the seed of the Resampler, so results are reproducible
+    regardless of the number of processes.
+    Columns with more than exact_rows values are resampled from bins of the sorted values: the number of draws
+    from every bin is resampled exactly, the draws within a bin are summed by their mean and variance.
+    Columns with at most bins distinct values are always resampled exactly.
+
+    Attributes
+    ----------
+    resamples : int
+        number of resamples
+    seed : int
+        seed of the random generator
+    max_workers : int
+        number of processes, None for the number of cores
+    """
+
+    # number of bins of big columns
+    bins = 1024
+    # number of values up to which columns are resampled value by value
+    exact_rows = 20000
+    # memory budget of a batch of resamples per process in bytes
+    memory_bytes = 256 * 1024 ** 2
+
+    def __init__(self, resamples: int = 10000, seed: int = 0, max_workers: int = None):
+        """
+        Inits the Resampler.
+
+        Parameters
+        ----------
+        resamples
+            [optional] number of resamples
+        seed
+            [optional] seed of the random generator
+        max_workers
+            [optional] number of processes, None for the number of cores
+        """
+        self.resamples = resamples
+        self.seed = seed
+        self.max_workers = max_workers
+
+    def binned(self, values):
+        """
+        function for summarizing values by bins of equal size (or by their distinct values if there are few)
+
+        Parameters
+        ----------
+        values
+            valid values as array
+
+        Returns
+        -------
+        bins
+            dict with counts, means and (population) variances of the bins
+        """
+        values = np.sort(values)
+        distinct, counts = np.unique(values, return_counts=True)
+        if len(distinct) <= self.bins:
+            return {"counts": counts, "means": distinct, "variances": np.zeros(len(distinct))}
+        starts = np.linspace(0, len(values), self.bins + 1).astype(np.int64)[:-1]
+        counts = np.diff(np.r_[starts, len(values)])
+        means = np.add.reduceat(values, starts) / counts
+        variances = np.add.reduceat(np.square(values - np.repeat(means, counts)), starts) / counts
+        return {"counts": counts, "means": means, "variances": variances}
+
+    def run(self, batch, data, row_bytes: int):
+        """
+        function for running all resamples in batches
+
+        Parameters
+        ----------
+        batch
+            function of a batch of resamples (seed, size)
+        data
+            data of the resampled columns which is sent once to every process
+        row_bytes
+            memory used by one resample in bytes
+
+        Returns
+        -------
+        results
+            statistic of every resample
+        """
+        batch_size = int(max(1, min(self.resamples, self.memory_bytes // max(row_bytes, 1))))
+        sizes = [min(batch_size, self.resamples - start) for start in range(0, self.resamples, batch_size)]
+        tasks = list(zip(np.random.SeedSequence(self.seed).spawn(len(sizes)), sizes))
+
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(tasks))
+        if max_workers <= 1:
+            _init_worker(data)
+            return np.concatenate([batch(task) for task in tasks])
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(data,)) as executor:
+            return np.concatenate(list(executor.map(batch, tasks)))
+
+    def bootstrap_means(self, values):
+        """
+        function for drawing bootstrap resamples of the mean
+
+        Parameters
+        ----------
+        values
+            values as array or Series. NaN values are dropped
+
+        Returns
+        -------
+        means
+            mean of every resample
+        """
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        data = {"n": len(values)}
+        if len(values) <= self.exact_rows:
+            data["values"] = values
+            row_bytes = 12 * len(values)
+        else:
+            bins = self.binned(values)
+            data.update(weights=bins["counts"] / len(values), means=bins["means"], variances=bins["variances"])
+            row_bytes = 16 * len(bins["counts"])
+        return self.run(_bootstrap_batch, data, row_bytes)
+
+    def permutation_differences(self, values1, values2):
+        """
+        function for drawing the differences of the means of two groups if the values are assigned
+        to the groups at random (null hypothesis of a permutation test)
+
+        Parameters
+        ----------
+        values1
+            values of the first group as array or Series. NaN values are dropped
+        values2
+            values of the second group as array or Series. NaN values are dropped
+
+        Returns
+        -------
+        differences
+            difference of the means (first - second group) of every permutation
+        """
+        values1 = np.asarray(values1, dtype="float64")
+        values2 = np.asarray(values2, dtype="float64")
+        pooled = np.concatenate((values1[~np.isnan(values1)], values2[~np.isnan(values2)]))
+        n1 = int(np.sum(~np.isnan(values1)))
+        data = {"n1": n1, "n2": len(pooled) - n1, "total": pooled.sum()}
+        if len(pooled) <= self.exact_rows:
+            data["values"] = pooled
+            row_bytes = 8 * len(pooled)
+        else:
+            bins = self.binned(pooled)
+            data.update(counts=bins["counts"], means=bins["means"], variances=bins["variances"])
+            row_bytes = 24 * len(bins["counts"])
+        return self.run(_permutation_batch, data, row_bytes)
@@ -0,0 +1,547 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class KLLSketch:
+    """
+    This class represents a KLL quantile sketch. It is built chunk by chunk, can be merged with the sketch of
+    another part of the column and keeps only O(k log(n/k)) values. Quantiles have a normalized rank error
+    of about rank_error (e.g. ~1.3% for k=200) with 99% probability. Until the first compaction the sketch keeps
+    every value, then quantiles are exact.
+
+    Attributes
+    ----------
+    k : int
+        size of the top compactor, controls the accuracy
+    count : int
+        number of valid values added to the sketch
+    minimum : float
+        smallest added value
+    maximum : float
+        top added value
+    levels : list
+        compactors. values of level h stand for 2^h values of the column
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        """
+        Inits the KLLSketch.
+
+        Parameters
+        ----------
+        k
+            [optional] size of the top compactor, controls the accuracy
+        seed
+            [optional] seed of the random compactions, makes the sketch reproducible
+        """
+        self.k = k
+        self.count = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self):
+        # whether every added value is kept (no level was compacted yet)
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self):
+        # normalized rank error bound (99% confidence) of a KLL sketch of size k, 0 as long as the sketch is exact
+        return 0.0 if self.exact else 2.296 / self.k ** 0.9723
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def capacity(self, level: int):
+        # capacities shrink by 2/3 per level below the top level
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def update(self, values):
+        """
+        function for adding a chunk of values. NaN values are skipped
+
+        Parameters
+        ----------
+        values
+            values of the chunk as array or Series
+        """
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    def merge(self, other):
+        """
+        function for merging the sketch of another part of the column (e.g. another file partition)
+
+        Parameters
+        ----------
+        other
+            KLLSketch of the other part
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], values))
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress()
+
+    def _compress(self):
+        # compact the lowest full level until every level keeps its capacity
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) < self.capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            values = np.sort(values)
+            # an odd value stays, of the others every second one is promoted with double weight
+            keep = values[len(values) - len(values) % 2:]
+            promoted = values[self._rng.integers(2):len(values) - len(values) % 2:2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level = 0
+
+    def quantile(self, percentile: float):
+        """
+        function for getting an approximate quantile
+
+        Parameters
+        ----------
+        percentile
+            percentile of quantile between 0 and 1
+
+        Returns
+        -------
+        quantile
+            approximate value of the quantile (exact with linear interpolation like pandas if the sketch is exact),
+            NaN if the sketch is empty
+        """
+        if self.count == 0:
+            return np.nan
+        if percentile <= 0:
+            return self.minimum
+        if percentile >= 1:
+            return self.maximum
+        if self.exact:
+            return np.quantile(self.levels[0], percentile)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_values), 2.0 ** level)
+                                  for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cum_weights = np.cumsum(weights[order])
+        index = np.searchsorted(cum_weights, percentile * cum_weights[-1], side="right")
+        return values[order][min(index, len(values) - 1)]
+
+    def save(self, path, source: bytes = b""):
+        """
+        function for persisting the sketch. The file is replaced atomically, so readers never see a partial sketch
+
+        Parameters
+        ----------
+        path
+            path of the file (.npz)
+        source
+            [optional] version of the source, a loaded sketch is only valid for the same source
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                np.savez(file, k=self.k, count=self.count, minimum=self.minimum, maximum=self.maximum,
+                         source=np.frombuffer(source, dtype=np.uint8),
+                         **{f"level{level}": values for level, values in enumerate(self.levels)})
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path, source: bytes = b""):
+        """
+        function for loading a persisted sketch
+
+        Parameters
+        ----------
+        path
+            path of the file (.npz)
+        source
+            [optional] version of the source which the sketch has to belong to
+
+        Returns
+        -------
+        sketch
+            KLLSketch or None if there is no valid sketch for the source
+        """
+        try:
+            with np.load(path) as data:
+                if data["source"].tobytes() != source:
+                    return None
+                sketch = cls(int(data["k"]))
+                sketch.count = int(data["count"])
+                sketch.minimum = float(data["minimum"])
+                sketch.maximum = float(data["maximum"])
+                levels = sorted((name for name in data.files if name.startswith("level")), key=lambda n: int(n[5:]))
+                sketch.levels = [data[name] for name in levels]
+        except (OSError, KeyError, ValueError):
+            return None
+        return sketch
+
+
+def hash_values(values):
+    """
+    function for hashing values to 64 bit. Numbers are hashed as float64, so 1 and 1.0 have the same hash
+    regardless of the dtype of the chunk they were read in
+
+    Parameters
+    ----------
+    values
+        values as array or Series
+
+    Returns
+    -------
+    hashes
+        uint64 array of the hashes
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        values = values.astype("float64")
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def bit_length(values):
+    # number of bits of uint64 values (0 for 0), found by a binary search over the shifts
+    values = values.copy()
+    length = np.zeros(values.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        length[high] += shift
+        values[high] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+class CountMinSketch:
+    """
+    This class represents a Count-Min sketch. Counts are never underestimated and overestimated by at most
+    error * (total count) with probability 1 - e^-depth
+
+    Attributes
+    ----------
+    width : int
+        number of counters per row
+    depth : int
+        number of rows (independent hash functions)
+    total : int
+        sum of all added counts
+    table : ndarray
+        counters (depth x width)
+    """
+
+    def __init__(self, width: int = 2 ** 14, depth: int = 5):
+        """
+        Inits the CountMinSketch.
+
+        Parameters
+        ----------
+        width
+            [optional] number of counters per row, controls the error
+        depth
+            [optional] number of rows, controls the probability of the error
+        """
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    @property
+    def error(self):
+        # overestimation relative to the total count
+        return np.e / self.width
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def positions(self, hashes):
+        # double hashing: row i uses h1 + i * h2 (Kirsch and Mitzenmacher)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = hashes >> np.uint64(32)
+        return [((low + np.uint64(row) * high) % np.uint64(self.width)).astype(np.int64) for row in range(self.depth)]
+
+    def update(self, hashes, counts):
+        """
+        function for adding counts
+
+        Parameters
+        ----------
+        hashes
+            uint64 hashes of the values
+        counts
+            number of occurrences of every value
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        for row, position in enumerate(self.positions(hashes)):
+            self.table[row] += np.bincount(position, weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+
+    def estimate(self, hashes):
+        """
+        function for estimating counts
+
+        Parameters
+        ----------
+        hashes
+            uint64 hashes of the values
+
+        Returns
+        -------
+        counts
+            estimated number of occurrences of every value
+        """
+        return np.min([self.table[row][position] for row, position in enumerate(self.positions(hashes))], axis=0)
+
+
+class HyperLogLog:
+    """
+    This class represents a HyperLogLog sketch for counting distinct values.
+    The relative standard error of the count is 1.04 / sqrt(2^precision)
+
+    Attributes
+    ----------
+    precision : int
+        number of hash bits which select a register
+    registers : ndarray
+        maximal rank of the hashes of every register
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Inits the HyperLogLog.
+
+        Parameters
+        ----------
+        precision
+            [optional] number of hash bits which select a register (2^precision registers)
+        """
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    @property
+    def error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    @property
+    def nbytes(self):
+        return self.registers.nbytes
+
+    def update(self, hashes):
+        """
+        function for adding values
+
+        Parameters
+        ----------
+        hashes
+            uint64 hashes of the values
+        """
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # rank is the position of the first 1-bit in the remaining bits
+        rank = (bits - bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        """
+        function for estimating the number of distinct values
+
+        Returns
+        -------
+        count
+            estimated number of distinct values
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # small range correction: linear counting
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class FrequencySketch:
+    """
+    This class represents approximate frequencies of a column in bounded memory.
+    Counts are estimated by a Count-Min sketch, candidates for the most frequent values are kept
+    by a Misra-Gries (Space-Saving) summary and distinct values are counted by a HyperLogLog.
+    Every value which occurs more than size / (capacity + 1) times is guaranteed to be a candidate.
+
+    Attributes
+    ----------
+    capacity : int
+        number of candidates for the most frequent values
+    size : int
+        number of rows, including NaN values
+    counts : CountMinSketch
+        estimated counts of all values
+    distinct : HyperLogLog
+        estimated number of distinct values
+    candidates : Series
+        lower bounds of the counts of the candidates (index)
+    """
+
+    # functions of stats_basic which can be answered by the sketch
+    functions = ("mode", "number of distinct values")
+
+    def __init__(self, capacity: int = 1000, width: int = 2 ** 14, depth: int = 5, precision: int = 14):
+        """
+        Inits the FrequencySketch.
+
+        Parameters
+        ----------
+        capacity
+            [optional] number of candidates for the most frequent values
+        width
+            [optional] width of the Count-Min sketch
+        depth
+            [optional] depth of the Count-Min sketch
+        precision
+            [optional] precision of the HyperLogLog
+        """
+        self.capacity = capacity
+        self.size = 0
+        self.counts = CountMinSketch(width, depth)
+        self.distinct = HyperLogLog(precision)
+        self.candidates = pd.Series(dtype="int64")
+
+    @property
+    def count_error(self):
+        # estimated counts are at most this number too high (with probability 1 - e^-depth)
+        return int(np.ceil(self.counts.error * self.counts.total))
+
+    @property
+    def relative_error(self):
+        # relative frequencies are at most this share too high
+        return self.counts.error * self.counts.total / self.size if self.size else np.nan
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + self.distinct.nbytes + int(self.candidates.memory_usage(deep=True))
+
+    def update(self, values):
+        """
+        function for adding a chunk of values. NaN values are counted in size only
+
+        Parameters
+        ----------
+        values
+            values of the chunk as array or Series
+        """
+        self.size += len(values)
+        chunk_counts = pd.Series(values).value_counts(sort=False)
+        if chunk_counts.empty:
+            return
+        hashes = hash_values(chunk_counts.index)
+        self.counts.update(hashes, chunk_counts.to_numpy())
+        self.distinct.update(hashes)
+        self.add_candidates(chunk_counts)
+
+    def add_candidates(self, counts):
+        # Misra-Gries merge: add the counters, then subtract the (capacity+1)-th largest count from all
+        candidates = self.candidates.add(counts, fill_value=0)
+        if len(candidates) > self.capacity:
+            candidates -= candidates.nlargest(self.capacity + 1).iloc[-1]
+            candidates = candidates[candidates > 0]
+        self.candidates = candidates.astype("int64")
+
+    def merge(self, other):
+        """
+        function for merging the sketch of another part of the column (e.g. another file partition)
+
+        Parameters
+        ----------
+        other
+            FrequencySketch of the other part
+        """
+        self.size += other.size
+        self.counts.merge(other.counts)
+        self.distinct.merge(other.distinct)
+        self.add_candidates(other.candidates)
+
+    def absolute(self, val):
+        return int(self.counts.estimate(hash_values([val]))[0])
+
+    def relative(self, val):
+        return self.absolute(val) / self.size if self.size else np.nan
+
+    def top(self, k: int):
+        """
+        function for getting the approximately most frequent values
+
+        Parameters
+        ----------
+        k
+            number of values
+
+        Returns
+        -------
+        top
+            Series of the k candidates with the highest estimated counts (values), sorted descending
+        """
+        if self.candidates.empty:
+            return pd.Series(dtype="int64")
+        estimates = pd.Series(self.counts.estimate(hash_values(self.candidates.index)), index=self.candidates.index)
+        return estimates.sort_values(ascending=False, kind="stable").head(k)
+
+    def mode(self):
+        """
+        function for getting the approximate mode(s)
+
+        Returns
+        -------
+        mode
+            sorted list of all candidates with the highest estimated count
+        """
+        top = self.top(self.capacity)
+        if top.empty:
+            return []
+        return sorted(top.index[top == top.iloc[0]].tolist())
+
+    def result(self, func: str):
+        """
+        function for getting the result of a statistical basic function
+
+        Parameters
+        ----------
+        func
+            function name. Possible function names are listed in FrequencySketch.functions
+
+        Returns
+        -------
+        result
+            value of the function
+        """
+        if func == "mode":
+            return self.mode()
+        return self.distinct.count()
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+
+from .exceptions import FileNotUniqueError
+
+
+class SourceIndex:
+    """
+    This class represents a persistent index of the files in a source directory.
+    Filenames are indexed lowercased and without their file type, so a file can be resolved by
+    a dict lookup. The index is rebuilt only if the mtime of the directory has changed.
+
+    Attributes
+    ----------
+    dir_path : str
+        path of the indexed directory
+    mtime : int
+        mtime (ns) of the directory at the last scan
+    """
+
+    # mtime of a directory which changed less than this amount of seconds before a scan can not be trusted,
+    # because file systems with coarse timestamps may change the directory again without a new mtime
+    racy_seconds = 2
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, dir_path):
+        """
+        Inits the SourceIndex.
+
+        Parameters
+        ----------
+        dir_path
+            path of the directory which should be indexed
+        """
+        self.dir_path = dir_path
+        self.mtime = None
+        self._racy = True
+        self._index = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, dir_path):
+        """
+        function for getting the shared index of a directory
+
+        Parameters
+        ----------
+        dir_path
+            path of the directory
+
+        Returns
+        -------
+        index
+            SourceIndex of the directory
+        """
+        with cls._instances_lock:
+            if dir_path not in cls._instances:
+                cls._instances[dir_path] = cls(dir_path)
+            return cls._instances[dir_path]
+
+    def refresh(self, force=False):
+        """
+        function for rescanning the directory if it has changed since the last scan
+
+        Parameters
+        ----------
+        force
+            [optional] rescan the directory even if it has not changed
+        """
+        with self._lock:
+            mtime = os.stat(self.dir_path).st_mtime_ns
+            if not force and not self._racy and mtime == self.mtime:
+                return
+
+            scan_time = time.time()
+            index = {}
+            with os.scandir(self.dir_path) as files:
+                for file in files:
+                    if file.is_file():
+                        index.setdefault(file.name.split(".", 1)[0].lower(), []).append(file.name)
+
+            self._index = index
+            self.mtime = mtime
+            self._racy = scan_time - mtime / 1e9 < self.racy_seconds
+
+    def lookup(self, name):
+        """
+        function for resolving a name to a filename
+
+        Parameters
+        ----------
+        name
+            name of the file without file type
+
+        Returns
+        -------
+        filename
+            name+file type of the file. e.g. 'test.csv'
+        """
+        self.refresh()
+        search_result = self._index.get(name.lower())
+
+        # If no result (=empty), raise FileNotFound Error
+        # if search result has more than 1 result, file cannot identified -> FileNotUnique Error
+        if not search_result:
+            raise FileNotFoundError("File not found")
+        elif len(search_result) > 1:
+            raise FileNotUniqueError("File has no unique name and hence cannot be identified")
+        return search_result[0]
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import subprocess
 import sys
@@ -9,25 +10,62 @@ import numpy as np
 import pandas as pd
 import scipy.stats as stats
 import seaborn as sns
-import statsmodels.formula.api as sm
-from sklearn.cluster import KMeans
+import statsmodels.api as sm
 
+from .clustering import ClusterModel
+from .columnstats import (CategoryCodes, ColumnProfile, ContingencyTable, FrequencyTable, GroupedProfile,
+                          MergeSortTree, PrefixIndex)
 from .exceptions import FunctionNotFoundError, ChartNotFoundError, HypothesisError
+from .pairwise import chi_squared_pairs, correct, paired_pairs, welch_pairs
+from .regression import DesignMatrix, StreamingOLS
+from .resampling import Resampler
+from .sketches import FrequencySketch, KLLSketch
+from .streaming import StreamingStats
 
 matplotlib.use('Agg')
 
 
 class StatistantCalc:
-    def __init__(self, df, filename: str = None, func: str = None):
-        self.df = df
+    def __init__(self, df, filename: str = None, func: str = None, file_handler=None, prefix_index: bool = False,
+                 sorted_index: bool = False):
+        self._df = df
         self.filename = filename
         self.func = func
         self.selected = None
 
+        # FileHandler which has read df. if only a row range was read, df starts at row_offset + 1 of the file
+        self.file_handler = file_handler
+        self.row_offset = 0 if file_handler is None else file_handler.row_offset
+
+        # structures derived from the content (e.g. column profiles) which were used by this calculator
+        self._derived = {}
+        self.selected_profile = None
+
+        # if True, interval sums, averages, variances and standard deviations are answered by a prefix-sum index
+        self.prefix_index = prefix_index
+        # if True, interval medians, quantiles, minima and maxima are answered by a merge-sort tree
+        self.sorted_index = sorted_index
+        # error bound of the last approximate result (rank error of quantiles, count error of frequencies,
+        # relative standard error of distinct counts), None if it was calculated exactly
+        self.approximate_error = None
+        # resampler of bootstrap and permutation tests (number of resamples, seed and processes)
+        self.resampler = Resampler()
+
         directory = f"statistant/results/{self.func}_{self.filename}_{token_hex(5)}.png"
         parent_dir = os.path.expanduser("~")
         self.path = os.path.join(parent_dir, directory)
 
+    @property
+    def df(self):
+        # content of the file is read at the first access, so streamed files are never loaded at once
+        if self._df is None and self.file_handler is not None:
+            self._df = self.file_handler.content
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+
     @staticmethod
     def open_file(filepath):
         """
@@ -45,25 +83,104 @@ class StatistantCalc:
             subprocess.call([opener, filepath])
 
     @staticmethod
-    def calc_gini(col):
+    def gini_sorted(sorted_values, sorted_weights=None):
+        """
+        function for calculating the gini coefficient of values which are already sorted ascending.
+        Uses the cumulative sum of the weights instead of all pairwise differences (O(n))
+
+        Parameters
+        ----------
+        sorted_values
+            values sorted ascending
+        sorted_weights
+            [optional] weights in the order of sorted_values. If None, every value has the weight 1
+
+        Returns
+        -------
+        gini
+            value of gini coefficient (3 decimals)
+        """
+        x = np.asarray(sorted_values, dtype="float64")
+        n = x.size
+        if sorted_weights is None:
+            # sum of all pairwise absolute differences: sum of x_i * (2i - n - 1)
+            diffsum = np.dot(x, 2 * np.arange(1, n + 1) - n - 1)
+            gini = (diffsum / (n * x.sum())).round(3)
+        else:
+            w = np.asarray(sorted_weights, dtype="float64")
+            total_weight = w.sum()
+            weight_before = np.cumsum(w) - w
+            diffsum = np.dot(w * x, 2 * weight_before + w - total_weight)
+            gini = (diffsum / (total_weight * np.dot(w, x))).round(3)
+        return gini
+
+    @staticmethod
+    def calc_gini(col, weights=None):
         """
 
         Parameters
         ----------
         col
             column which should be used for calculating the gini coefficient
+        weights
+            [optional] weights of the values of col (e.g. population of a region)
 
         Returns
         -------
         gini
             value of gini coefficient
         """
-        col = col.to_numpy()
-        diffsum = 0
-        for i, xi in enumerate(col[:-1], 1):
-            diffsum += np.sum(np.abs(xi - col[i:]))
-        gini = (diffsum / (len(col) ** 2 * np.mean(col))).round(3)
-        return gini
+        x = np.asarray(col, dtype="float64")
+        if weights is None:
+            return StatistantCalc.gini_sorted(np.sort(x))
+        w = np.asarray(weights, dtype="float64")
+        valid = ~(np.isnan(x) | np.isnan(w))
+        order = np.argsort(x[valid], kind="stable")
+        return StatistantCalc.gini_sorted(x[valid][order], w[valid][order])
+
+    @staticmethod
+    def calc_gini_grouped(col, groups, weights=None):
+        """
+        function for calculating the gini coefficient of every group in one vectorized pass
+
+        Parameters
+        ----------
+        col
+            column which should be used for calculating the gini coefficient
+        groups
+            group label of every value of col
+        weights
+            [optional] weights of the values of col
+
+        Returns
+        -------
+        gini
+            Series with the gini coefficient (3 decimals) per group
+        """
+        x = np.asarray(col, dtype="float64")
+        w = np.ones_like(x) if weights is None else np.asarray(weights, dtype="float64")
+        codes, labels = pd.factorize(pd.Series(groups), sort=True)
+        valid = ~(np.isnan(x) | np.isnan(w)) & (codes >= 0)
+        x, w, codes = x[valid], w[valid], codes[valid]
+        if x.size == 0:
+            return pd.Series(dtype="float64")
+
+        # one sort for all groups: by group, then by value
+        order = np.lexsort((x, codes))
+        x, w, codes = x[order], w[order], codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+        # weight before each value within its group
+        cum_weight = np.cumsum(w)
+        group_offset = (cum_weight - w)[starts]
+        sizes = np.diff(np.r_[starts, x.size])
+        weight_before = cum_weight - w - np.repeat(group_offset, sizes)
+        total_weight = np.add.reduceat(w, starts)
+
+        diffsum = np.add.reduceat(w * x * (2 * weight_before + w - np.repeat(total_weight, sizes)), starts)
+        weighted_total = np.add.reduceat(w * x, starts)
+        gini = (diffsum / (total_weight * weighted_total)).round(3)
+        return pd.Series(gini, index=labels[codes[starts]])
 
     @staticmethod
     def calc_herfindahl(col):
@@ -72,20 +189,83 @@ class StatistantCalc:
         Parameters
         ----------
         col
-            column which should be used for calculating the herfindahl index
+            column which should be used for calculating the herfindahl index. NaN values are dropped
 
         Returns
         -------
         herfindahl
             value of herfindahl index
         """
-        sum_col = col.sum()
-        herfindahl = 0
-        for i in col:
-            fi_squared = (i / sum_col) ** 2
-            herfindahl += fi_squared
+        x = np.asarray(col, dtype="float64")
+        x = x[~np.isnan(x)]
+        herfindahl = np.square(x / x.sum()).sum()
         return herfindahl
 
+    @staticmethod
+    def calc_herfindahl_batch(values, groups=None):
+        """
+        function for calculating the herfindahl index of many columns and/or groups in one pass.
+        NaN values are dropped per column
+
+        Parameters
+        ----------
+        values
+            DataFrame (or 2d array) with one column per market
+        groups
+            [optional] group label of every row. If given, the index is calculated per group and column
+
+        Returns
+        -------
+        herfindahl
+            Series with the index per column or DataFrame with the index per group (rows) and column (3 decimals)
+        """
+        columns = values.columns if isinstance(values, pd.DataFrame) else None
+        x = np.asarray(values, dtype="float64")
+        x = x.reshape(len(x), -1)
+        x = np.where(np.isnan(x), 0.0, x)
+
+        if groups is None:
+            totals = x.sum(axis=0)
+            herfindahl = np.square(x / totals).sum(axis=0)
+            return pd.Series(herfindahl, index=columns).round(3)
+
+        codes, labels = pd.factorize(pd.Series(groups), sort=True)
+        valid = codes >= 0
+        x, codes = x[valid], codes[valid]
+        if x.shape[0] == 0:
+            return pd.DataFrame(columns=columns, dtype="float64")
+
+        # sort rows by group once, then sum per group and column with reduceat
+        order = np.argsort(codes, kind="stable")
+        x, codes = x[order], codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        totals = np.add.reduceat(x, starts, axis=0)
+        squares = np.add.reduceat(np.square(x), starts, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # groups without values get NaN
+            herfindahl = squares / np.square(totals)
+        return pd.DataFrame(herfindahl, index=labels[codes[starts]], columns=columns).round(3)
+
+    def herfindahl(self, cols, by: str = None):
+        """
+        function for calculating the herfindahl index of one or many columns, optionally per group
+
+        Parameters
+        ----------
+        cols
+            column name or list of column names
+        by
+            [optional] column with the groups (e.g. segments)
+
+        Returns
+        -------
+        herfindahl
+            Series with the index per column or DataFrame with the index per group and column
+        """
+        cols = [cols] if isinstance(cols, str) else list(cols)
+        groups = None if by is None else self.df[by]
+        return self.calc_herfindahl_batch(self.df[cols], groups)
+
     def stats_basic(self, func: str, col: str, interval=False, lower: int = None, upper: int = None):
         """
         Function for statistical basic functions.
@@ -94,7 +274,8 @@ class StatistantCalc:
         ----------
         func
             is the function name which should be called.
-            Possible function names are: average, median, mode, variance, standard deviation, min, max, sum
+            Possible function names are: average, median, mode, variance, standard deviation, min, max, sum,
+            number of distinct values
         col
             is the column which should be selected
         interval
@@ -110,29 +291,36 @@ class StatistantCalc:
             result (=value) of called function
 
         """
-        # .astype() for fallback for int64
-        self.do_selection(col, interval, lower, upper)
-        # function chooser
-        df = self.selected
-        function = {
-            "average": df.mean,
-            "median": df.median,
-            "variance": df.var,
-            "mode": df.mode().to_list,
-            "standard deviation": df.std,
-            "smallest value": df.min,
-            "top value": df.max,
-            "sum": df.sum,
-            "quartile range": self.iqr,
-            "range": self.data_range
-        }
-        # safe call for function chooser
-        if func in function.keys():
-            result = function[func]()
+        self.approximate_error = None
+        if self.use_streaming(func, interval, lower, upper):
+            result = self.stats_streaming(func, col)
+            return result if result is None else round(result, 3)
+        if func in FrequencySketch.functions and self.use_streaming(None, interval, lower, upper):
+            sketch = self.frequency_sketch(col, interval, lower, upper)
+            result = sketch.result(func)
+            self.approximate_error = sketch.count_error if func == "mode" else sketch.distinct.error
+            return [float(value) for value in result] if func == "mode" else result
+
+        if interval and self.prefix_index and func in PrefixIndex.functions:
+            result = self.stats_prefix(func, col, lower, upper)
+            return round(result, 3)
+        if interval and self.sorted_index and func in MergeSortTree.functions:
+            start, stop = self.interval_positions(lower, upper)
+            result = self.sorted_tree(col).result(func, start, stop)
+            return round(result, 3)
+
+        # the mode and distinct values are answered by the count table, which is shared with frequencies and pie charts
+        if func == "mode":
+            return [float(value) for value in self.frequency_table(col, interval, lower, upper).mode()]
+        if func == "number of distinct values":
+            return len(self.frequency_table(col, interval, lower, upper).counts)
+
+        # all functions are answered by the profile of the selection, which is computed once per selection
+        profile = self.profile(col, interval, lower, upper)
+        if func in ColumnProfile.functions:
+            result = profile.result(func)
         elif func == "gini coefficient":
-            result = self.calc_gini(df)
-        elif func == "herfindahl index":
-            result = self.calc_herfindahl(df)
+            result = self.gini_sorted(profile.sorted)
         else:
             raise FunctionNotFoundError(f"Function {func} is not a valid function")
 
@@ -140,6 +328,264 @@ class StatistantCalc:
         # -> mode can not be rounded because of list type
         return result if type(result) == list or result is None else round(result, 3)
 
+    def use_streaming(self, func: str = None, interval=False, lower: int = None, upper: int = None):
+        """
+        function for checking if a statistical basic function should be calculated by streaming the file.
+        This is the case if the file is too big to be read at once, the function can be streamed
+        and the FileHandler reads exactly the requested rows.
+
+        Parameters
+        ----------
+        func
+            [optional] is the function name which should be called. None if the caller streams the file itself
+        interval
+            [optional] bool if there should be an interval as selected or not
+        lower
+            [optional] lower value of selected interval
+        upper
+            [optional] upper value of selected interval
+
+        Returns
+        -------
+        streaming
+            True if the file should be streamed
+        """
+        handler = self.file_handler
+        if handler is None or not handler.streaming or handler.is_cached():
+            return False
+        if func is not None and func not in StreamingStats.functions:
+            return False
+        # an interval needs both bounds
+        interval = interval and lower is not None and upper is not None
+        rows = (min(lower, upper), max(lower, upper)) if interval else None
+        return handler.rows == rows
+
+    def stats_streaming(self, func: str, col: str):
+        """
+        function for calculating a statistical basic function in one pass over the chunks of the file
+
+        Parameters
+        ----------
+        func
+            is the function name which should be called. Possible function names are listed in StreamingStats.functions
+        col
+            is the column which should be selected
+
+        Returns
+        -------
+        result
+            result (=value) of called function
+        """
+        return self.streaming_stats([col])[0].result(func)
+
+    def streaming_stats(self, cols):
+        """
+        function for getting the streaming statistics of columns. All columns which were not streamed yet
+        are streamed together in one pass over the chunks of the file. Statistics of the whole file are persisted
+        in statistant/sketches, so they are only streamed again if the file has changed
+
+        Parameters
+        ----------
+        cols
+            columns which should be selected. A tuple (col1, col2) selects the difference col1 - col2 of two columns
+
+        Returns
+        -------
+        stats
+            list of StreamingStats in the order of cols
+        """
+        handler = self.file_handler
+        missing = [col for col in dict.fromkeys(cols) if ("streaming", col) not in self._derived]
+        # only statistics of all rows are persisted
+        paths = {} if handler.rows is not None else {col: self.moments_path(col) for col in missing}
+        for col in list(missing):
+            streaming_stats = None if col not in paths else StreamingStats.load(paths[col], handler.sidecar_source())
+            if streaming_stats is not None:
+                self._derived[("streaming", col)] = streaming_stats
+                missing.remove(col)
+
+        if missing:
+            streaming_stats = {col: StreamingStats() for col in missing}
+            for chunk in handler.read_csv_chunks():
+                for col in missing:
+                    if isinstance(col, tuple):
+                        streaming_stats[col].update(chunk[col[0]].astype('float64') - chunk[col[1]].astype('float64'))
+                    else:
+                        streaming_stats[col].update(chunk[col].astype('float64'))
+            for col in missing:
+                self._derived[("streaming", col)] = streaming_stats[col]
+                if col in paths:
+                    try:
+                        os.makedirs(os.path.dirname(paths[col]), exist_ok=True)
+                        streaming_stats[col].save(paths[col], handler.sidecar_source())
+                    except OSError:
+                        pass
+        return [self._derived[("streaming", col)] for col in cols]
+
+    def moments_path(self, col):
+        # persisted streaming statistics of a column or of the difference (tuple) of two columns.
+        # the pair is hashed, because any separator can be part of a column name
+        if isinstance(col, tuple):
+            return self.file_handler.sketch_path(hashlib.sha256(repr(col).encode()).hexdigest()[:16], "difference")
+        return self.file_handler.sketch_path(col, "moments")
+
+    def moments(self, col):
+        """
+        function for getting count, mean and variance of the valid values of a column.
+        Streamed files are not read at all if their moments were persisted before,
+        else the moments of the cached profile are used
+
+        Parameters
+        ----------
+        col
+            column which should be selected. A tuple (col1, col2) selects the difference col1 - col2 of two columns
+
+        Returns
+        -------
+        moments
+            StreamingStats or ColumnProfile (both have count, mean and variance)
+        """
+        if self.use_streaming():
+            return self.streaming_stats([col])[0]
+        if isinstance(col, tuple):
+            def build():
+                streaming_stats = StreamingStats()
+                streaming_stats.update(self.df[col[0]].astype('float64') - self.df[col[1]].astype('float64'))
+                return streaming_stats
+
+            return self.derived(("difference", col, self.selection_rows()), build)
+        return self.profile(col)
+
+    def run_batch(self, queries):
+        """
+        function for answering many questions on the file at once.
+        The file is read once, queries are answered grouped by column and selection, so selections,
+        profiles, indexes and count tables are shared. Streamed columns are streamed together in one pass.
+
+        Parameters
+        ----------
+        queries
+            iterable of (func, col, lower, upper) or (func, col, lower, upper, value) tuples.
+            lower and upper are integer row numbers, None for the whole column. func is a function of stats_basic,
+            "quantile" (value is the percentile) or "absolute frequency" / "relative frequency" (value is the counted
+            value)
+
+        Returns
+        -------
+        results
+            DataFrame with one row per query in the order of queries. Columns are function, column, lower, upper,
+            value, result, approximate_error and error (message if the query could not be answered)
+        """
+        queries = [tuple(query) + (None,) * (5 - len(query)) for query in queries]
+        # a query is an interval query if both bounds are given
+        intervals = [lower is not None and upper is not None for func, col, lower, upper, value in queries]
+        # invalid bounds are reported by their queries before any query is planned, so they can not abort the batch
+        errors = [None] * len(queries)
+        for i, (func, col, lower, upper, value) in enumerate(queries):
+            if not intervals[i] and (lower is not None or upper is not None):
+                errors[i] = "ValueError: an interval needs a lower and an upper row"
+            elif intervals[i] and not all(isinstance(bound, (int, np.integer)) for bound in (lower, upper)):
+                errors[i] = "ValueError: the rows of an interval must be integers"
+        valid = [i for i in range(len(queries)) if errors[i] is None]
+
+        # a streamed file is only streamed if no query needs the whole content, else it is read once up front.
+        # all columns which are answered by streaming statistics are streamed together in one pass
+        sketched = FrequencySketch.functions + ("quantile", "absolute frequency", "relative frequency")
+        if all(self.use_streaming(None, intervals[i], queries[i][2], queries[i][3])
+               and (queries[i][0] in StreamingStats.functions or queries[i][0] in sketched) for i in valid):
+            try:
+                self.streaming_stats([queries[i][1] for i in valid if queries[i][0] in StreamingStats.functions])
+            except KeyError:
+                # unknown columns are reported by their queries
+                pass
+        elif self.file_handler is not None:
+            self.df = self.file_handler.content
+
+        results = [query + (None, None, errors[i]) for i, query in enumerate(queries)]
+        order = sorted(valid, key=lambda i: (str(queries[i][1]),
+                                             self.selection_rows(intervals[i], queries[i][2], queries[i][3]) or ()))
+        for i in order:
+            func, col, lower, upper, value = queries[i]
+            interval = intervals[i]
+            result, error = None, None
+            try:
+                if func == "quantile":
+                    result = self.quantiles(col, value, interval, lower, upper)
+                elif func in ("absolute frequency", "relative frequency"):
+                    result = self.frequency(value, col, func.split()[0], interval, lower, upper)
+                else:
+                    result = self.stats_basic(func, col, interval, lower, upper)
+            except (KeyError, IndexError, ValueError, FunctionNotFoundError) as e:
+                error = f"{type(e).__name__}: {e}"
+            results[i] = (func, col, lower, upper, value, result, None if error else self.approximate_error, error)
+        return pd.DataFrame(results, columns=["function", "column", "lower", "upper", "value", "result",
+                                              "approximate_error", "error"])
+
+    def stats_prefix(self, func: str, col: str, lower: int, upper: int):
+        """
+        function for calculating a statistical basic function of an interval with the prefix-sum index of the column.
+        The index is built at the first interval question and cached alongside the content
+
+        Parameters
+        ----------
+        func
+            is the function name which should be called. Possible function names are listed in PrefixIndex.functions
+        col
+            is the column which should be selected
+        lower
+            lower value of selected interval
+        upper
+            upper value of selected interval
+
+        Returns
+        -------
+        result
+            result (=value) of called function
+        """
+        rows = None if self.file_handler is None else self.file_handler.rows
+        index = self.derived(("prefix", col, rows), lambda: PrefixIndex(self.df[col].astype('float64')))
+        start, stop = self.interval_positions(lower, upper)
+        return index.result(func, start, stop)
+
+    def sorted_tree(self, col: str):
+        """
+        function for getting the merge-sort tree of a column.
+        The tree is built at the first interval question and cached alongside the content
+
+        Parameters
+        ----------
+        col
+            is the column which should be selected
+
+        Returns
+        -------
+        tree
+            MergeSortTree of the column
+        """
+        rows = None if self.file_handler is None else self.file_handler.rows
+        return self.derived(("tree", col, rows), lambda: MergeSortTree(self.df[col].astype('float64')))
+
+    def interval_positions(self, lower: int, upper: int):
+        """
+        function for getting the positions of an interval in the content, the same rows as do_selection selects
+
+        Parameters
+        ----------
+        lower
+            lower value of interval
+        upper
+            upper value of interval
+
+        Returns
+        -------
+        positions
+            (start, stop) positions of the rows in the content
+        """
+        if lower > upper:
+            lower, upper = upper, lower
+        start, stop, step = slice(lower - 1 - self.row_offset, upper - self.row_offset).indices(len(self.df.index))
+        return start, stop
+
     def mean_2_cells(self, val1: int, val2: int, col: str):
         """
         function for calculating the mean of 2 cells in one column
@@ -169,9 +615,7 @@ class StatistantCalc:
         iqr
             inter quartile range
         """
-        q1 = self.selected.quantile(0.25)
-        q3 = self.selected.quantile(0.75)
-        iqr = q3 - q1
+        iqr = self.current_profile().iqr()
         return iqr
 
     def data_range(self):
@@ -184,12 +628,16 @@ class StatistantCalc:
             range
 
         """
-        data_range = self.selected.max() - self.selected.min()
+        data_range = self.current_profile().data_range()
         return data_range
 
-    def quantiles(self, col: str, percentile: float, interval=False, lower: int = None, upper: int = None):
+    def quantiles(self, col: str, percentile: float, interval=False, lower: int = None, upper: int = None,
+                  approximate: bool = None):
         """
-        function for calculating quantiles
+        function for calculating quantiles.
+        Quantiles of files which are too big to be read at once are approximated by a KLL sketch,
+        the rank error of the approximation is stored in self.approximate_error.
+        Selections which fit into the sketch without compaction are answered exactly (approximate_error stays None)
 
         Parameters
         ----------
@@ -203,16 +651,273 @@ class StatistantCalc:
             [optional] lower value of interval
         upper
             [optional] upper value of interval
+        approximate
+            [optional] True if the quantile should be approximated by a sketch, False if it should be exact.
+            By default it is approximated only if the file is streamed
 
         Returns
         -------
         quantile
             rounded quantile (3 decimals)
         """
-        self.do_selection(col, interval, lower, upper)
-        quantile = self.selected.quantile(percentile)
+        if approximate is None:
+            approximate = self.use_streaming(None, interval, lower, upper)
+
+        self.approximate_error = None
+        if approximate:
+            sketch = self.quantile_sketch(col, interval, lower, upper)
+            quantile = sketch.quantile(percentile)
+            self.approximate_error = None if sketch.exact else sketch.rank_error
+        elif interval and self.sorted_index:
+            start, stop = self.interval_positions(lower, upper)
+            quantile = self.sorted_tree(col).quantile(start, stop, percentile)
+        else:
+            quantile = self.profile(col, interval, lower, upper).quantile(percentile)
         return round(quantile, 3)
 
+    def quantile_sketch(self, col: str, interval=False, lower: int = None, upper: int = None):
+        """
+        function for getting the KLL sketch of a selection.
+        Streamed files are sketched chunk by chunk, the sketch of a whole column is persisted in
+        statistant/sketches and reused as long as the file is unchanged
+
+        Parameters
+        ----------
+        col
+            column which should be selected
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+
+        Returns
+        -------
+        sketch
+            KLLSketch of the selection
+        """
+        handler = self.file_handler
+        if not self.use_streaming(None, interval, lower, upper):
+            def build():
+                self.do_selection(col, interval, lower, upper)
+                sketch = KLLSketch()
+                sketch.update(self.selected)
+                return sketch
+
+            return self.derived(("sketch", col, self.selection_rows(interval, lower, upper)), build)
+
+        # only the sketch of the whole column is persisted, sketches of intervals are built on demand
+        path = handler.sketch_path(col) if handler.rows is None else None
+        sketch = None if path is None else KLLSketch.load(path, handler.sidecar_source())
+        if sketch is None:
+            sketch = KLLSketch()
+            for chunk in handler.read_csv_chunks():
+                sketch.update(chunk[col])
+            if path is not None:
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    sketch.save(path, handler.sidecar_source())
+                except OSError:
+                    pass
+        return sketch
+
+    def derived(self, name, build):
+        """
+        function for getting a structure derived from the content of the file (e.g. a column profile).
+        It is built once and stored alongside the content in the cache of the FileHandler,
+        so follow-up questions on the same version of the file reuse it
+
+        Parameters
+        ----------
+        name
+            hashable name of the structure
+        build
+            function without parameters which builds the structure
+
+        Returns
+        -------
+        value
+            derived structure
+        """
+        value = self.cached(name)
+        if value is None:
+            value = build()
+            handler = self.file_handler
+            if handler is not None:
+                handler.cache.put_derived(handler.content_key, name, value, getattr(value, "nbytes", 0))
+        self._derived[name] = value
+        return value
+
+    def cached(self, name):
+        """
+        function for looking up a derived structure without building it
+
+        Parameters
+        ----------
+        name
+            hashable name of the structure
+
+        Returns
+        -------
+        value
+            derived structure or None if it was not built yet
+        """
+        if name in self._derived:
+            return self._derived[name]
+        handler = self.file_handler
+        return None if handler is None else handler.cache.get_derived(handler.resolve_content_key(), name)
+
+    def selection_rows(self, interval=False, lower=None, upper=None):
+        """
+        function for getting the rows of a selection as row numbers of the file
+
+        Parameters
+        ----------
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+
+        Returns
+        -------
+        rows
+            (lower, upper) row numbers or None if the selection contains all rows of the file
+        """
+        if interval and lower is not None and upper is not None:
+            return min(lower, upper), max(lower, upper)
+        return None if self.file_handler is None else self.file_handler.rows
+
+    def profile(self, col: str, interval=False, lower=None, upper=None):
+        """
+        function for getting the profile of a selection. Sets self.selected_profile
+
+        Parameters
+        ----------
+        col
+            column which should be selected
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+
+        Returns
+        -------
+        profile
+            ColumnProfile of the selection
+        """
+        def build():
+            self.do_selection(col, interval, lower, upper)
+            return ColumnProfile(self.selected)
+
+        self.selected_profile = self.derived(("profile", col, self.selection_rows(interval, lower, upper)), build)
+        return self.selected_profile
+
+    def current_profile(self):
+        """
+        function for getting the profile of the current selection
+
+        Returns
+        -------
+        profile
+            ColumnProfile of self.selected
+        """
+        if self.selected_profile is None:
+            self.selected_profile = ColumnProfile(self.selected)
+        return self.selected_profile
+
+    def sorted_selection(self, col: str, interval=False, lower=None, upper=None):
+        """
+        function for getting the valid values of a selection sorted ascending.
+        The sort is part of the profile and hence shared by all functions of the selection
+
+        Parameters
+        ----------
+        col
+            column which should be selected
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+
+        Returns
+        -------
+        sorted_values
+            array of the sorted values
+        """
+        return self.profile(col, interval, lower, upper).sorted
+
+    def gini(self, col: str, weights: str = None, by: str = None):
+        """
+        function for calculating the (weighted) gini coefficient of a column, optionally per group
+
+        Parameters
+        ----------
+        col
+            column which should be used for calculating the gini coefficient
+        weights
+            [optional] column with the weights of the values
+        by
+            [optional] column with the groups. If given, the gini coefficient is calculated per group
+
+        Returns
+        -------
+        gini
+            value of gini coefficient or Series with the gini coefficient per group
+        """
+        weight_col = None if weights is None else self.df[weights]
+        if by is not None:
+            return self.calc_gini_grouped(self.df[col], self.df[by], weight_col)
+        if weight_col is None:
+            return self.gini_sorted(self.sorted_selection(col))
+        return self.calc_gini(self.df[col], weight_col)
+
+    def stats_grouped(self, func: str, col: str, by: str, interval=False, lower: int = None, upper: int = None,
+                      percentile: float = None):
+        """
+        function for calculating a statistical basic function per group (e.g. average of sales by region).
+        All groups are profiled together in one sort pass, the profile is cached alongside the content
+
+        Parameters
+        ----------
+        func
+            is the function name which should be called.
+            Possible function names are listed in GroupedProfile.functions and "quantile"
+        col
+            is the column which should be selected
+        by
+            is the column with the groups
+        interval
+            [optional] bool if there should be an interval as selected or not
+        lower
+            [optional] lower value of selected interval
+        upper
+            [optional] upper value of selected interval
+        percentile
+            [optional] percentile of quantile, needed if func is "quantile"
+
+        Returns
+        -------
+        result
+            Series with the rounded result (3 decimals) per group. Modes are lists
+        """
+        if func not in GroupedProfile.functions and func != "quantile":
+            raise FunctionNotFoundError(f"Function {func} is not a valid function")
+
+        def build():
+            return GroupedProfile(self.raw_selection(col, interval, lower, upper),
+                                  self.raw_selection(by, interval, lower, upper))
+
+        profile = self.derived(("grouped", col, by, self.selection_rows(interval, lower, upper)), build)
+        result = profile.result(func, percentile)
+        return result if func == "mode" else result.round(3)
+
     def do_selection(self, col: str, interval=False, lower=None, upper=None):
         """
         functions for performing a selection of a DataFrame. Sets self.selected
@@ -228,13 +933,15 @@ class StatistantCalc:
         upper
             [optional] upper value of interval
         """
+        self.selected_profile = None
         if not interval:
             self.selected = self.df[col].astype('float64')
         else:
             if lower > upper:
                 lower, upper = upper, lower
-            # select interval
-            self.selected = self.df.loc[self.df.index[(lower - 1):upper], col].astype('float64')
+            # select interval (row numbers of the file, shifted if only a row range of the file was read)
+            offset = self.row_offset
+            self.selected = self.df.loc[self.df.index[(lower - 1 - offset):(upper - offset)], col].astype('float64')
         # drop all NaN in selected interval
         self.selected.dropna(how="all", inplace=True)
 
@@ -259,16 +966,14 @@ class StatistantCalc:
             [optional] label for y-axis of plot
         """
 
-        df = self.df
-        x_col = self.df[x_colname]
-        y_col = self.df[y_colname]
-
-        # variables for cluster analysis
-        kmeans = KMeans(n_clusters=num_clusters).fit(df)
-        centroids = kmeans.cluster_centers_
+        # only the plotted columns are clustered, the model is cached per version of the file, columns and k
+        model = self.cluster_model([x_colname, y_colname], num_clusters)
+        x_col = self.df[x_colname][model.valid]
+        y_col = self.df[y_colname][model.valid]
+        centroids = model.centroids
 
         # init plot
-        plt.scatter(x_col, y_col, c=kmeans.labels_.astype(float), s=70, alpha=0.5)
+        plt.scatter(x_col, y_col, c=model.labels.astype(float), s=70, alpha=0.5)
         plt.scatter(centroids[:, 0], centroids[:, 1], c='red', s=50)
 
         # optional adjustments by user
@@ -283,9 +988,72 @@ class StatistantCalc:
         # Open plot
         self.open_file(self.path)
 
-    def frequency(self, val: int, col: str, kind: str = "absolute"):
+    def cluster_model(self, cols, num_clusters: int):
         """
-        function for calculating frequency of cell
+        function for getting the k-means model of feature columns.
+        It is fitted once per version of the file, columns and number of clusters and stored alongside the content,
+        so adjusting the title or labels of a cluster analysis does not refit it
+
+        Parameters
+        ----------
+        cols
+            feature columns which should be clustered
+        num_clusters
+            number of clusters
+
+        Returns
+        -------
+        model
+            fitted ClusterModel
+        """
+        cols = list(cols)
+        return self.derived(("kmeans", tuple(cols), num_clusters, self.selection_rows()),
+                            lambda: ClusterModel(self.df[cols], num_clusters))
+
+    def recommend_num_clusters(self, cols, max_clusters: int = 10, max_workers: int = None):
+        """
+        function for recommending the number of clusters of feature columns.
+        Every number of clusters from 2 to max_clusters is fitted in parallel processes and scored with the
+        silhouette of a sample of the rows. The fitted models are cached like in cluster_model,
+        so a cluster analysis with any of the candidates does not refit
+
+        Parameters
+        ----------
+        cols
+            feature columns which should be clustered
+        max_clusters
+            [optional] highest number of clusters which is evaluated
+        max_workers
+            [optional] number of processes, default is the number of cores
+
+        Returns
+        -------
+        num_clusters
+            number of clusters with the highest silhouette, None if there are not enough rows
+        """
+        cols = list(cols)
+        features = self.df[cols]
+        rows = int(features.notna().all(axis=1).sum())
+        candidates = range(2, min(max_clusters, rows - 1) + 1)
+        names = {k: ("kmeans", tuple(cols), k, self.selection_rows()) for k in candidates}
+
+        models = {k: self.cached(name) for k, name in names.items()}
+        missing = [k for k, model in models.items() if model is None]
+        if missing:
+            fitted = ClusterModel.fit_candidates(features, missing, max_workers)
+            for k in missing:
+                models[k] = self.derived(names[k], lambda: fitted[k])
+        for model in models.values():
+            model.score(features)
+        return ClusterModel.recommend(models)
+
+    def frequency(self, val: int, col: str, kind: str = "absolute", interval=False, lower: int = None,
+                  upper: int = None, approximate: bool = None):
+        """
+        function for calculating frequency of cell.
+        Frequencies of files which are too big to be read at once are estimated by a FrequencySketch,
+        the error bound of the estimate is stored in self.approximate_error
+
         Parameters
         ----------
         val
@@ -294,13 +1062,137 @@ class StatistantCalc:
             is column of value
         kind
             kind of frequency: absolute or relative
+        interval
+            [optional] boolean if the frequency should be calculated in an interval
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+        approximate
+            [optional] True if the frequency should be estimated by a sketch, False if it should be exact.
+            By default it is estimated only if the file is streamed
+
+        Returns
+        -------
+        frequency
+            rounded frequency (3 decimals). Relative frequencies are shares of all rows including empty ones
+        """
+        if approximate is None:
+            approximate = self.use_streaming(None, interval, lower, upper)
+
+        self.approximate_error = None
+        if approximate:
+            table = self.frequency_sketch(col, interval, lower, upper)
+            # estimates are never too low and at most count_error too high
+            self.approximate_error = table.count_error if kind == "absolute" else table.relative_error
+        else:
+            table = self.frequency_table(col, interval, lower, upper)
+        frequency = table.absolute(val) if kind == "absolute" else table.relative(val)
+        return round(np.float64(frequency), 3)
+
+    def frequency_table(self, col: str, interval=False, lower: int = None, upper: int = None):
+        """
+        function for getting the hashed count table of a selection.
+        It is counted once per version of the file and selection and shared by frequencies, mode and pie charts
+
+        Parameters
+        ----------
+        col
+            column which should be selected
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+
+        Returns
+        -------
+        table
+            FrequencyTable of the selection
+        """
+        if self.use_streaming(None, interval, lower, upper):
+            chunks = (chunk[col] for chunk in self.file_handler.read_csv_chunks())
+            return self.derived(("frequency", col, self.selection_rows(interval, lower, upper)),
+                                lambda: FrequencyTable.from_chunks(chunks))
+
+        return self.derived(("frequency", col, self.selection_rows(interval, lower, upper)),
+                            lambda: FrequencyTable.from_values(self.raw_selection(col, interval, lower, upper)))
+
+    def category_codes(self, col: str):
+        """
+        function for getting the factorized column. It is factorized once per version of the file
+        and shared by all chi-squared tests of the column
+
+        Parameters
+        ----------
+        col
+            column which should be selected
+
+        Returns
+        -------
+        codes
+            CategoryCodes of the column
+        """
+        return self.derived(("codes", col, self.selection_rows()), lambda: CategoryCodes(self.df[col]))
+
+    def frequency_sketch(self, col: str, interval=False, lower: int = None, upper: int = None):
+        """
+        function for getting the frequency sketch of a selection. Streamed files are sketched chunk by chunk,
+        so the memory used does not grow with the number of distinct values
+
+        Parameters
+        ----------
+        col
+            column which should be selected
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
 
         Returns
         -------
+        sketch
+            FrequencySketch of the selection
+        """
+        def build():
+            sketch = FrequencySketch()
+            if self.use_streaming(None, interval, lower, upper):
+                for chunk in self.file_handler.read_csv_chunks():
+                    sketch.update(chunk[col])
+            else:
+                sketch.update(self.raw_selection(col, interval, lower, upper))
+            return sketch
+
+        return self.derived(("frequency sketch", col, self.selection_rows(interval, lower, upper)), build)
+
+    def raw_selection(self, col: str, interval=False, lower: int = None, upper: int = None):
+        """
+        function for selecting the values of a column as they are in the file (no cast, NaN values are kept)
 
+        Parameters
+        ----------
+        col
+            column which should be selected
+        interval
+            [optional] boolean if interval should be selected
+        lower
+            [optional] lower value of interval
+        upper
+            [optional] upper value of interval
+
+        Returns
+        -------
+        values
+            Series of the selection
         """
-        return round(self.df[col].value_counts()[val].astype("float64"), 3) if kind == "absolute" else round(
-            self.df[col].value_counts()[val].astype("float64") / len(self.df[col]), 3)
+        values = self.df[col]
+        if interval and lower is not None and upper is not None:
+            start, stop = min(lower, upper) - 1 - self.row_offset, max(lower, upper) - self.row_offset
+            values = values.iloc[max(start, 0):max(stop, 0)]
+        return values
 
     def charts(self, chart: str, x_colname: str = None, y_colname: str = None,
                title: str = None, x_label: str = None, y_label: str = None, x_lim=None, y_lim=None, color=None):
@@ -391,10 +1283,11 @@ class StatistantCalc:
             pieplot which is created
         """
 
-        df = self.df
+        # equal values are aggregated to one slice, the share of a slice is the sum of its values
+        values, counts = self.frequency_table(colname).items()
 
         fig, ax = plt.subplots()
-        ax.pie(df[colname], labels=df[colname], startangle=90)
+        ax.pie(values * counts, labels=values, startangle=90)
         ax.legend(bbox_to_anchor=(1.2, 0.6))
         ax.set_title(title)
         plt.tight_layout()
@@ -419,18 +1312,21 @@ class StatistantCalc:
             regression model
 
         """
+        if kind != "logistic" and self.use_streaming():
+            return self.streaming_regression([x_col], y_col)
         if x_col not in self.df.columns or y_col not in self.df.columns:
             raise KeyError
 
-        formula = f"{y_col}~{x_col}"
         if kind == "logistic":
             # check if values for y are all between 0 and 1
             between = self.df[y_col].between(0, 1).all()
             if not between:
                 raise ValueError(f'values of {y_col} are not between 0 and 1')
-            model = sm.logit(data=self.df, formula=formula).fit()  # logistic regression
+            design = self.design_matrix([x_col], y_col)
+            model = sm.Logit(design.endog, design.exog).fit()  # logistic regression
         else:
-            model = sm.ols(data=self.df, formula=formula).fit()  # linear regression
+            design = self.design_matrix([x_col], y_col)
+            model = sm.OLS(design.endog, design.exog).fit()  # linear regression
 
         return model
 
@@ -452,22 +1348,68 @@ class StatistantCalc:
             regression model
 
         """
+        if kind != "logistic" and self.use_streaming():
+            return self.streaming_regression(x_cols, y_col)
         column_check = [x for x in x_cols if x in self.df.columns]
-        if not column_check or y_col not in self.df.columns:
+        if len(column_check) < len(x_cols) or y_col not in self.df.columns:
             raise KeyError('columns do not exist')
 
-        x_formula = "+".join(x_cols)
-
-        formula = f"{y_col}~{x_formula}"
         if kind == "logistic":
             # check if values for y are all between 0 and 1
             between = self.df[y_col].between(0, 1).all()
             if not between:
                 raise ValueError(f'values of {y_col} are not between 0 and 1')
-            model = sm.mnlogit(data=self.df, formula=formula).fit()  # logistic regression
+            design = self.design_matrix(x_cols, y_col)
+            model = sm.MNLogit(design.endog, design.exog).fit()  # logistic regression
         else:
-            model = sm.ols(data=self.df, formula=formula).fit()  # linear regression
+            design = self.design_matrix(x_cols, y_col)
+            model = sm.OLS(design.endog, design.exog).fit()  # linear regression
+
+        return model
+
+    def design_matrix(self, x_cols, y_col: str, dtype="float64"):
+        """
+        function for getting the design matrix of a regression. It is built once per version of the file
+        and shared by linear and logistic regressions of the same columns
+
+        Parameters
+        ----------
+        x_cols
+            column names of x
+        y_col
+            column name of y
+        dtype
+            [optional] dtype of the matrix (float64 or float32)
+
+        Returns
+        -------
+        design
+            DesignMatrix with endog and exog
+        """
+        return self.derived(("design", tuple(x_cols), y_col, np.dtype(dtype).name, self.selection_rows()),
+                            lambda: DesignMatrix(self.df, x_cols, y_col, dtype))
 
+    def streaming_regression(self, x_cols, y_col: str):
+        """
+        function for performing a linear regression in one pass over the chunks of the file,
+        so files which do not fit into memory can be regressed
+
+        Parameters
+        ----------
+        x_cols
+            column names of x
+        y_col
+            column name of y
+
+        Returns
+        -------
+        model
+            StreamingOLS of the regression
+        """
+        model = StreamingOLS(x_cols, y_col)
+        for chunk in self.file_handler.read_csv_chunks():
+            # missing columns raise a KeyError like in the regressions of loaded files
+            model.update(chunk[list(x_cols)], chunk[y_col])
         return model
 
     def hypothesis_test(self, hypothesis):
@@ -496,10 +1438,48 @@ class StatistantCalc:
             func = self.paired_sample_test
         elif "are independent" in hypothesis:
             func = self.chi_squared_test
+        elif "has an average of" in hypothesis:
+            func = self.bootstrap_test
+        elif "have the same average" in hypothesis:
+            func = self.permutation_test
         else:
             raise HypothesisError("no valid hypothesis")
         return func(hypothesis)
 
+    def hypothesis_all_pairs(self, alpha: float = 0.05, correction: str = "holm", max_categories: int = 20,
+                             max_workers: int = None):
+        """
+        function for performing Welch, paired and chi-squared tests for every pair of columns of the file.
+        The t-tests are calculated for all pairs at once from moment vectors and matrices, the chi-squared tests
+        run in parallel processes. P-values are corrected for multiple comparisons within every kind of test
+
+        Parameters
+        ----------
+        alpha
+            [optional] significance level
+        correction
+            [optional] "holm" (family-wise error rate) or "bh" (Benjamini-Hochberg, false discovery rate)
+        max_categories
+            [optional] columns with at most this number of distinct values are tested with chi-squared tests
+        max_workers
+            [optional] number of processes for the chi-squared tests, default is the number of cores
+
+        Returns
+        -------
+        results
+            DataFrame with test, column1, column2, statistic, pvalue, p_adjusted and significant per test
+        """
+        df = self.df
+        numeric = df.select_dtypes("number").select_dtypes(exclude="bool")
+        categorical = [col for col in df.columns if df[col].nunique() <= max_categories]
+
+        results = pd.concat([welch_pairs(numeric), paired_pairs(numeric),
+                             chi_squared_pairs(df[categorical], max_workers)], ignore_index=True)
+        results["p_adjusted"] = results.groupby("test", sort=False)["pvalue"].transform(
+            lambda pvalues: correct(pvalues, correction))
+        results["significant"] = results["p_adjusted"] < alpha
+        return results
+
     def one_sample_test(self, hypothesis):
         """
         function for performing one sample test
@@ -519,10 +1499,36 @@ class StatistantCalc:
         col = hypothesis_split[0].lower()
 
         alt_hypothesis = f"{col} does not corresponds to the population"
-        tscore, pval = stats.ttest_1samp(a=self.df[col], popmean=self.df[col].mean())
+        moments = self.moments(col)
+        tscore, pval = self.ttest_from_moments(moments, moments.mean)
         answer = alt_hypothesis if pval < 0.05 else hypothesis
         return answer
 
+    @staticmethod
+    def ttest_from_moments(moments, popmean: float = 0.0):
+        """
+        function for performing a one sample t-test from the moments of a sample like scipy's ttest_1samp
+
+        Parameters
+        ----------
+        moments
+            count, mean and variance of the sample (e.g. ColumnProfile or StreamingStats)
+        popmean
+            [optional] expected value of the population
+
+        Returns
+        -------
+        tscore, pval
+            t statistic and two-sided p-value. NaN if there are less than 2 values
+        """
+        n = moments.count
+        if n < 2:
+            return np.nan, np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tscore = (moments.mean - popmean) / np.sqrt(moments.variance / n)
+        pval = 2 * stats.t.sf(np.abs(tscore), n - 1)
+        return tscore, pval
+
     def two_sample_test(self, hypothesis):
         """
         function for performing a two sample test
@@ -542,7 +1548,11 @@ class StatistantCalc:
         col2 = hypothesis_split[2].lower()
 
         alt_hypothesis = f"{col1} and {col2} are not equal"
-        tscore, pval = stats.ttest_ind(a=self.df[col1], b=self.df[col2], equal_var=False)
+        # welch test only needs count, mean and variance of both columns
+        moments1, moments2 = self.moments(col1), self.moments(col2)
+        tscore, pval = stats.ttest_ind_from_stats(moments1.mean, np.sqrt(moments1.variance), moments1.count,
+                                                  moments2.mean, np.sqrt(moments2.variance), moments2.count,
+                                                  equal_var=False)
         answer = alt_hypothesis if pval < 0.05 else hypothesis
         return answer
 
@@ -565,7 +1575,9 @@ class StatistantCalc:
         after = hypothesis_split[-1].lower()
 
         alt_hypothesis = f"There is not a difference between {before} and {after}"
-        tscore, pval = stats.ttest_rel(a=self.df[before], b=self.df[after])
+        # paired test is a one sample test of the differences, which are taken in float64,
+        # so differences of compact integer columns can not overflow
+        tscore, pval = self.ttest_from_moments(self.moments((before, after)))
         answer = alt_hypothesis if pval < 0.05 else hypothesis
         return answer
 
@@ -589,8 +1601,63 @@ class StatistantCalc:
 
         alt_hypothesis = f"{col1} and {col2} are not independent"
 
-        ct = pd.crosstab(self.df[col1], self.df[col2])
-        chi, pval, dof, exp = stats.chi2_contingency(ct)
+        table = ContingencyTable.from_codes(self.category_codes(col1), self.category_codes(col2))
+        chi, pval, dof = table.chi_squared()
+        answer = alt_hypothesis if pval < 0.05 else hypothesis
+        return answer
+
+    def bootstrap_test(self, hypothesis):
+        """
+        function for performing a bootstrap test of the mean. The hypothesis is rejected if the value
+        is outside of the 95 percent percentile interval of the bootstrap means
+
+        Parameters
+        ----------
+        hypothesis
+            is the hypothesis
+        Returns
+        -------
+        answer
+            answer of hypothesis with the confidence interval
+        """
+        # hypothesis: {attr} has an average of {value}
+        hypothesis_split = hypothesis.split(" ")
+        col = hypothesis_split[0].lower()
+        try:
+            value = float(hypothesis_split[-1])
+        except ValueError:
+            raise HypothesisError("no valid value")
+
+        alt_hypothesis = f"{col} does not have an average of {hypothesis_split[-1]}"
+        means = self.resampler.bootstrap_means(self.df[col])
+        lower, upper = np.quantile(means, [0.025, 0.975])
+        answer = alt_hypothesis if value < lower or value > upper else hypothesis
+        return f"{answer}, the 95 percent confidence interval is {lower:.4g} to {upper:.4g}"
+
+    def permutation_test(self, hypothesis):
+        """
+        function for performing a permutation test of the difference of the means of two columns
+
+        Parameters
+        ----------
+        hypothesis
+            is the hypothesis
+        Returns
+        -------
+        answer
+            answer of hypothesis
+        """
+        # hypothesis: {attr_1} and {attr_2} have the same average
+        hypothesis_split = hypothesis.split(" ")
+        col1 = hypothesis_split[0].lower()
+        col2 = hypothesis_split[2].lower()
+
+        alt_hypothesis = f"{col1} and {col2} do not have the same average"
+        values1, values2 = self.df[col1], self.df[col2]
+        observed = values1.mean() - values2.mean()
+        differences = self.resampler.permutation_differences(values1, values2)
+        # two-sided p-value, the observed assignment counts as one of the permutations
+        pval = (1 + np.sum(np.abs(differences) >= abs(observed))) / (len(differences) + 1)
         answer = alt_hypothesis if pval < 0.05 else hypothesis
         return answer
 
@@ -612,13 +1679,10 @@ class StatistantCalc:
             lorenz curve which is created
         """
 
-        df = self.df
-        col = df[colname]
-
-        df = np.asarray(col)
-        sorted_df = np.sort(df)
+        # sort is shared with the gini coefficient of the same column
+        sorted_df = self.sorted_selection(colname)
         y = (sorted_df / sorted_df.sum()).cumsum()
-        n = df.shape[0]
+        n = sorted_df.shape[0]
         x = np.arange(1, n + 1) / n
 
         fig, ax = plt.subplots()
@@ -0,0 +1,170 @@
+import os
+
+import numpy as np
+
+
+class StreamingStats:
+    """
+    This class represents one-pass statistics of a column which is read in chunks.
+    Count, mean and sum of squared deviations are merged chunk by chunk (Welford/Chan),
+    so memory usage is constant regardless of the size of the file.
+
+    Attributes
+    ----------
+    count : int
+        number of valid (not NaN) values
+    nan_count : int
+        number of NaN values
+    mean : float
+        arithmetic average of the valid values
+    m2 : float
+        sum of squared deviations from the mean
+    total : float
+        sum of the valid values
+    minimum : float
+        smallest valid value
+    maximum : float
+        top valid value
+    """
+
+    # functions of stats_basic which can be answered by streaming statistics
+    functions = ("average", "variance", "standard deviation", "smallest value", "top value", "sum", "range")
+
+    def __init__(self):
+        self.count = 0
+        self.nan_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values):
+        """
+        function for adding a chunk of values
+
+        Parameters
+        ----------
+        values
+            values of the chunk as array or Series
+        """
+        values = np.asarray(values, dtype="float64")
+        valid = values[~np.isnan(values)]
+        self.nan_count += values.size - valid.size
+        if valid.size == 0:
+            return
+
+        chunk = StreamingStats()
+        chunk.count = valid.size
+        chunk.total = valid.sum()
+        chunk.mean = chunk.total / chunk.count
+        chunk.m2 = np.square(valid - chunk.mean).sum()
+        chunk.minimum = valid.min()
+        chunk.maximum = valid.max()
+        self.merge(chunk)
+
+    def merge(self, other):
+        """
+        function for merging the statistics of another part of the column (Chan et al.)
+
+        Parameters
+        ----------
+        other
+            StreamingStats of the other part
+        """
+        self.nan_count += other.nan_count
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self):
+        # sample variance (ddof=1) like pandas
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    def result(self, func: str):
+        """
+        function for getting the result of a statistical basic function
+
+        Parameters
+        ----------
+        func
+            function name. Possible function names are listed in StreamingStats.functions
+
+        Returns
+        -------
+        result
+            value of the function. NaN if there are no valid values (sum is 0 like in pandas)
+        """
+        if func == "sum":
+            return self.total
+        if self.count == 0:
+            return np.nan
+        function = {
+            "average": lambda: self.mean,
+            "variance": lambda: self.variance,
+            "standard deviation": lambda: np.sqrt(self.variance),
+            "smallest value": lambda: self.minimum,
+            "top value": lambda: self.maximum,
+            "range": lambda: self.maximum - self.minimum
+        }
+        return function[func]()
+
+    def save(self, path, source: bytes = b""):
+        """
+        function for persisting the statistics. The file is replaced atomically
+
+        Parameters
+        ----------
+        path
+            path of the file (.npz)
+        source
+            [optional] version of the source, loaded statistics are only valid for the same source
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                np.savez(file, count=self.count, nan_count=self.nan_count, mean=self.mean, m2=self.m2,
+                         total=self.total, minimum=self.minimum, maximum=self.maximum,
+                         source=np.frombuffer(source, dtype=np.uint8))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path, source: bytes = b""):
+        """
+        function for loading persisted statistics
+
+        Parameters
+        ----------
+        path
+            path of the file (.npz)
+        source
+            [optional] version of the source which the statistics have to belong to
+
+        Returns
+        -------
+        stats
+            StreamingStats or None if there are no valid statistics for the source
+        """
+        try:
+            with np.load(path) as data:
+                if data["source"].tobytes() != source:
+                    return None
+                streaming_stats = cls()
+                streaming_stats.count = int(data["count"])
+                streaming_stats.nan_count = int(data["nan_count"])
+                for name in ("mean", "m2", "total", "minimum", "maximum"):
+                    setattr(streaming_stats, name, float(data[name]))
+        except (OSError, KeyError, ValueError):
+            return None
+        return streaming_stats
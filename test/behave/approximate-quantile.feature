@@ -0,0 +1,15 @@
+Feature: calculate-approximate-quantile
+  Scenario: calculate approximate 0.1 quantile
+    Given an english speaking user
+    When the user says "tell me the approximate 10 percentile quantile of value in uniform"
+    Then "statistant-skill" should reply with exactly "The 0.1 quantile is approximately 1132.0, within 1.3 percent of the rank"
+
+  Scenario: estimate 0.9 quantile
+    Given an english speaking user
+    When the user says "estimate the 90 percentile quantile of value in uniform"
+    Then "statistant-skill" should reply with exactly "The 0.9 quantile is approximately 9091.0, within 1.3 percent of the rank"
+
+  Scenario: estimate 0.1 quantile of a small column exactly
+    Given an english speaking user
+    When the user says "estimate the 10 percentile quantile of x in test"
+    Then "statistant-skill" should reply with exactly "The 0.1 quantile is 6.5"
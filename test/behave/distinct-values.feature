@@ -0,0 +1,15 @@
+Feature: calculate-distinct-values
+  Scenario: calculate number of distinct values
+    Given an english speaking user
+    When the user says "tell me the number of distinct values of x in test"
+    Then "statistant-skill" should reply with exactly "The number of distinct values is 6"
+
+  Scenario: calculate number of distinct values alternative
+    Given an english speaking user
+    When the user says "what is the number of distinct values of hello in test"
+    Then "statistant-skill" should reply with exactly "The number of distinct values is 8"
+
+  Scenario: calculate number of distinct values of an interval of a categorical column
+    Given an english speaking user
+    When the user says "tell me the number of distinct values of row 1 until row 2 of color in colors"
+    Then "statistant-skill" should reply with exactly "The number of distinct values is 1"
@@ -0,0 +1,10 @@
+Feature: calculate-grouped
+  Scenario: calculate median per group
+    Given an english speaking user
+    When the user says "tell me the median of y by test in test"
+    Then "statistant-skill" should reply with exactly "The median of y per test is 1 26.0, 4 26.0, 5 3.0, 45 23.0, 54 55.0"
+
+  Scenario: calculate median per group alternative
+    Given an english speaking user
+    When the user says "what is the median of y per test in test"
+    Then "statistant-skill" should reply with exactly "The median of y per test is 1 26.0, 4 26.0, 5 3.0, 45 23.0, 54 55.0"
@@ -0,0 +1,10 @@
+Feature: calculate-interval-empty-row
+  Scenario: calculate sum of an interval after an empty row
+    Given an english speaking user
+    When the user says "tell me the sum of row 2 until row 3 of a in gap"
+    Then "statistant-skill" should reply with exactly "The sum is 5.0"
+
+  Scenario: calculate average of an interval after an empty row
+    Given an english speaking user
+    When the user says "what is the average of row 2 until row 3 of a in gap"
+    Then "statistant-skill" should reply with exactly "The average is 2.5"
@@ -0,0 +1,47 @@
+import os
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the skill is imported as the package statistant without running its __init__, which needs a mycroft core
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "statistant" not in sys.modules:
+    _package = types.ModuleType("statistant")
+    _package.__path__ = [_root]
+    sys.modules["statistant"] = _package
+
+
+@pytest.fixture
+def numbers():
+    """
+    DataFrame with numerical columns of different scales, NaN values and a group column
+    """
+    rng = np.random.default_rng(42)
+    n = 500
+    df = pd.DataFrame({
+        "sales": rng.gamma(2.0, 50.0, n),
+        "costs": rng.normal(100.0, 20.0, n),
+        "units": rng.integers(1, 20, n).astype("float64"),
+        "score": rng.normal(0.5, 1.0, n),
+        "region": rng.choice(["north", "south", "east", "west"], n),
+    })
+    df.loc[rng.choice(n, 40, replace=False), "sales"] = np.nan
+    df.loc[rng.choice(n, 25, replace=False), "costs"] = np.nan
+    df.loc[rng.choice(n, 10, replace=False), "region"] = None
+    return df
+
+
+@pytest.fixture
+def testfile():
+    """
+    function for reading a file of test/testfile with lowercased column names like the skill
+    """
+    def read(name: str):
+        df = pd.read_csv(os.path.join(_root, "test", "testfile", f"{name}.csv"))
+        df.columns = df.columns.str.lower()
+        return df
+
+    return read
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from statistant.clustering import ClusterModel
+
+
+@pytest.fixture
+def features():
+    # three separated groups with some empty features
+    rng = np.random.default_rng(3)
+    x = np.concatenate([rng.normal(center, 1.0, (200, 2)) for center in (0.0, 8.0, 16.0)])
+    x[rng.choice(len(x), 15, replace=False), 1] = np.nan
+    return pd.DataFrame(x, columns=["a", "b"])
+
+
+def assert_same_models(models, expected):
+    assert list(models) == list(expected)
+    for k, model in models.items():
+        np.testing.assert_array_equal(model.valid, expected[k].valid)
+        np.testing.assert_array_equal(model.labels, expected[k].labels)
+        assert model.silhouette == pytest.approx(expected[k].silhouette, nan_ok=True)
+
+
+def test_candidates_are_the_same_in_processes(features, monkeypatch):
+    expected = ClusterModel.fit_candidates(features, range(2, 6), max_workers=1)
+    assert ClusterModel.recommend(expected) == 3
+    assert all(expected[k].valid.sum() == 585 for k in expected)
+    # the synthetic package of the tests can only be imported by forked processes
+    monkeypatch.setattr(ClusterModel, "start_method", "fork")
+    assert_same_models(ClusterModel.fit_candidates(features, range(2, 6), max_workers=2), expected)
+
+
+def test_candidates_are_fitted_here_if_processes_fail(features):
+    # started processes can not import the synthetic package of the tests
+    expected = ClusterModel.fit_candidates(features, [2, 3], max_workers=1)
+    assert_same_models(ClusterModel.fit_candidates(features, [2, 3], max_workers=2), expected)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as stats
+
+from statistant.columnstats import CategoryCodes, ContingencyTable
+from statistant.statistantcalc import StatistantCalc
+
+
+@pytest.fixture
+def categories():
+    rng = np.random.default_rng(5)
+    n = 600
+    df = pd.DataFrame({
+        "region": rng.choice(["north", "south", "east", "west"], n),
+        "product": rng.choice(["a", "b", "c", "d", "e", "f"], n),
+        "returning": rng.choice([True, False], n),
+        "channel": rng.choice(["web", "store"], n),
+    })
+    df.loc[rng.choice(n, 50, replace=False), "product"] = None
+    df.loc[rng.choice(n, 20, replace=False), "region"] = None
+    return df
+
+
+def table(df, col1: str, col2: str):
+    return ContingencyTable.from_codes(CategoryCodes(df[col1]), CategoryCodes(df[col2]))
+
+
+@pytest.mark.parametrize("col1, col2", [("region", "product"), ("returning", "channel"), ("product", "channel")])
+def test_dense_table_matches_crosstab(categories, col1, col2):
+    contingency = table(categories, col1, col2)
+    crosstab = pd.crosstab(categories[col1], categories[col2])
+    assert not contingency.sparse
+    # same counts up to the order of the categories
+    assert sorted(contingency.table.ravel()) == sorted(crosstab.to_numpy().ravel())
+
+    chi, pval, dof, expected = stats.chi2_contingency(crosstab)
+    assert contingency.chi_squared() == pytest.approx((chi, pval, dof), rel=1e-9)
+
+
+def test_sparse_table_matches_scipy(categories, monkeypatch):
+    monkeypatch.setattr(ContingencyTable, "max_cells", 4)
+    contingency = table(categories, "region", "product")
+    assert contingency.sparse
+    chi, pval, dof, expected = stats.chi2_contingency(pd.crosstab(categories["region"], categories["product"]))
+    assert contingency.chi_squared() == pytest.approx((chi, pval, dof), rel=1e-9)
+
+
+def test_two_by_two_table_stays_dense(categories, monkeypatch):
+    # Yates' correction is applied to 2x2 tables, which is only done for dense tables
+    monkeypatch.setattr(ContingencyTable, "max_cells", 1)
+    contingency = table(categories, "returning", "channel")
+    assert not contingency.sparse
+    chi, pval, dof, expected = stats.chi2_contingency(pd.crosstab(categories["returning"], categories["channel"]))
+    assert contingency.chi_squared() == pytest.approx((chi, pval, dof), rel=1e-9)
+
+
+def test_categories_without_valid_partner_are_dropped():
+    df = pd.DataFrame({"a": ["x", "x", "y", "z", "z"], "b": ["p", "q", "p", None, None]})
+    # z only occurs with NaN values of b
+    assert table(df, "a", "b").shape == pd.crosstab(df["a"], df["b"]).shape == (2, 2)
+
+
+def test_calculator_decides_like_scipy(categories):
+    calc = StatistantCalc(categories)
+    for col1, col2 in [("region", "product"), ("returning", "channel")]:
+        chi, pval, dof, expected = stats.chi2_contingency(pd.crosstab(categories[col1], categories[col2]))
+        hypothesis = f"{col1} and {col2} are independent"
+        expected_answer = f"{col1} and {col2} are not independent" if pval < 0.05 else hypothesis
+        assert calc.chi_squared_test(hypothesis) == expected_answer
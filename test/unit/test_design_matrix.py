@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+import statsmodels.formula.api as smf
+from patsy import dmatrices
+
+from statistant.regression import DesignMatrix
+from statistant.statistantcalc import StatistantCalc
+
+
+@pytest.fixture
+def observations(numbers):
+    df = numbers.assign(returning=numbers["units"] > 10)
+    df["profit"] = df["sales"] - df["costs"] + 5 * df["returning"]
+    return df
+
+
+def test_matches_patsy(observations):
+    design = DesignMatrix(observations, ["costs", "region", "returning"], "sales")
+    y, x = dmatrices("sales ~ costs + region + returning", observations, return_type="dataframe")
+    # numerical columns are kept, other columns are dummy coded without the first level, rows with NaN are dropped.
+    # columns keep the order of x_cols (patsy puts categorical columns first)
+    assert sorted(design.exog.columns) == sorted(x.columns)
+    pd.testing.assert_frame_equal(design.exog, x[design.exog.columns], check_dtype=False)
+    pd.testing.assert_series_equal(design.endog, y["sales"], check_dtype=False)
+
+
+def test_regression_matches_formula(observations):
+    calc = StatistantCalc(observations)
+    model = calc.multiple_regression("linear", ["costs", "units", "region"], "profit")
+    expected = smf.ols("profit ~ costs + units + region", data=observations).fit()
+    pd.testing.assert_series_equal(model.params, expected.params[model.params.index], rtol=1e-9)
+    pd.testing.assert_series_equal(model.bse, expected.bse[model.bse.index], rtol=1e-9)
+    assert model.nobs == expected.nobs
+    assert model.rsquared == pytest.approx(expected.rsquared, rel=1e-9)
+    assert model.fvalue == pytest.approx(expected.fvalue, rel=1e-9)
+
+
+def test_column_names_are_not_parsed(observations):
+    df = observations.rename(columns={"costs": "unit costs (eur)", "sales": "sales-2023"})
+    design = DesignMatrix(df, ["unit costs (eur)"], "sales-2023")
+    expected = smf.ols('Q("sales-2023") ~ Q("unit costs (eur)")', data=df).fit()
+    assert list(design.exog.columns) == ["Intercept", "unit costs (eur)"]
+    np.testing.assert_allclose(sm.OLS(design.endog, design.exog).fit().params, expected.params, rtol=1e-9)
+
+
+def test_float32_matrix(observations):
+    design = DesignMatrix(observations, ["costs", "region"], "sales", dtype="float32")
+    reference = DesignMatrix(observations, ["costs", "region"], "sales")
+    assert design.exog.dtypes.eq(np.float32).all()
+    assert design.nbytes < reference.nbytes
+    np.testing.assert_allclose(design.exog, reference.exog, rtol=1e-6)
+
+
+def test_missing_columns(observations):
+    with pytest.raises(KeyError):
+        DesignMatrix(observations, ["costs", "unknown"], "sales")
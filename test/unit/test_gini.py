@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from statistant.statistantcalc import StatistantCalc
+
+
+def pairwise_gini(values, weights=None):
+    # gini coefficient from all pairwise absolute differences (definition, O(n^2))
+    x = np.asarray(values, dtype="float64")
+    w = np.ones_like(x) if weights is None else np.asarray(weights, dtype="float64")
+    total_weight = w.sum()
+    mean = np.dot(w, x) / total_weight
+    return np.sum(np.outer(w, w) * np.abs(x[:, None] - x[None, :])) / (2 * total_weight ** 2 * mean)
+
+
+def test_gini_matches_definition(numbers):
+    calc = StatistantCalc(numbers)
+    assert calc.gini("sales") == pytest.approx(round(pairwise_gini(numbers["sales"].dropna()), 3), abs=1e-12)
+
+
+def test_weighted_gini_matches_definition(numbers):
+    valid = numbers[["sales", "units"]].dropna()
+    calc = StatistantCalc(numbers)
+    expected = pairwise_gini(valid["sales"], valid["units"])
+    assert calc.gini("sales", weights="units") == pytest.approx(round(expected, 3), abs=1e-12)
+
+
+def test_integer_weights_repeat_values(numbers):
+    valid = numbers[["sales", "units"]].dropna()
+    repeated = np.repeat(valid["sales"].to_numpy(), valid["units"].astype(int))
+    assert StatistantCalc.calc_gini(valid["sales"], valid["units"]) == StatistantCalc.calc_gini(repeated)
+
+
+@pytest.mark.parametrize("weights", [None, "units"])
+def test_grouped_gini_matches_groupby(numbers, weights):
+    calc = StatistantCalc(numbers)
+    result = calc.gini("sales", weights=weights, by="region")
+
+    columns = ["sales", "region"] + ([] if weights is None else [weights])
+    expected = numbers[columns].dropna().groupby("region").apply(
+        lambda group: round(pairwise_gini(group["sales"], None if weights is None else group[weights]), 3))
+    # rows without a group are dropped like in groupby
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+def test_gini_of_test_file(testfile):
+    df = testfile("test")
+    assert StatistantCalc(df).gini("x") == round(pairwise_gini(df["x"].dropna()), 3) == 0.364
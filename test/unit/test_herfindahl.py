@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from statistant.statistantcalc import StatistantCalc
+
+
+def herfindahl(values):
+    # sum of the squared market shares of the valid values
+    shares = values.dropna() / values.dropna().sum()
+    return (shares ** 2).sum()
+
+
+def test_batch_matches_single_columns(numbers):
+    cols = ["sales", "costs", "units"]
+    result = StatistantCalc(numbers).herfindahl(cols)
+    expected = pd.Series({col: round(herfindahl(numbers[col]), 3) for col in cols})
+    pd.testing.assert_series_equal(result, expected)
+    for col in cols:
+        assert round(StatistantCalc.calc_herfindahl(numbers[col]), 3) == result[col]
+
+
+def test_grouped_matches_groupby(numbers):
+    cols = ["sales", "units"]
+    result = StatistantCalc(numbers).herfindahl(cols, by="region")
+    expected = numbers.groupby("region")[cols].agg(herfindahl).round(3)
+    pd.testing.assert_frame_equal(result, expected, check_names=False)
+
+
+def test_group_without_values_is_nan():
+    df = pd.DataFrame({"a": [1.0, 3.0, np.nan, np.nan], "group": ["x", "x", "y", "y"]})
+    result = StatistantCalc(df).herfindahl("a", by="group")
+    assert result.loc["x", "a"] == round(0.25 ** 2 + 0.75 ** 2, 3)
+    assert np.isnan(result.loc["y", "a"])
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from statistant.columnstats import MergeSortTree
+from statistant.statistantcalc import StatistantCalc
+
+
+def pandas_result(values, func: str):
+    # result of a function of MergeSortTree.functions by pandas
+    if func == "median":
+        return values.median()
+    if func == "quartile range":
+        return values.quantile(0.75) - values.quantile(0.25)
+    return {"smallest value": values.min(), "top value": values.max(), "range": values.max() - values.min()}[func]
+
+
+def intervals(n: int, count: int = 150, seed: int = 0):
+    # random (start, stop) intervals crossing block borders, including empty and single rows
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, n, count)
+    stops = np.minimum(starts + rng.integers(0, n // 2, count), n)
+    return list(zip(starts, stops)) + [(0, n), (31, 33), (64, 65), (7, 7)]
+
+
+@pytest.mark.parametrize("func", MergeSortTree.functions)
+def test_intervals_match_pandas(numbers, func):
+    values = numbers["sales"]
+    tree = MergeSortTree(values)
+    for start, stop in intervals(len(values)):
+        expected = pandas_result(values.iloc[start:stop], func)
+        np.testing.assert_allclose(tree.result(func, start, stop), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("percentile", [0.01, 0.1, 0.25, 0.5, 0.9, 0.99])
+def test_quantiles_match_pandas(numbers, percentile):
+    # integer values have many ties
+    values = numbers["units"].where(numbers["sales"].notna())
+    tree = MergeSortTree(values)
+    for start, stop in intervals(len(values), seed=1):
+        np.testing.assert_allclose(tree.quantile(start, stop, percentile),
+                                   values.iloc[start:stop].quantile(percentile), rtol=1e-12)
+
+
+def test_interval_without_values():
+    tree = MergeSortTree(pd.Series([1.0, np.nan, np.nan, 4.0]))
+    assert np.isnan(tree.median(1, 3))
+    assert np.isnan(tree.result("range", 1, 3))
+    assert tree.median(0, 4) == 2.5
+
+
+@pytest.mark.parametrize("func", MergeSortTree.functions)
+def test_calculator_answers_like_without_index(numbers, func):
+    indexed = StatistantCalc(numbers, sorted_index=True)
+    plain = StatistantCalc(numbers)
+    for lower, upper in [(1, 500), (2, 40), (17, 17), (100, 321)]:
+        assert indexed.stats_basic(func, "sales", True, lower, upper) == \
+            pytest.approx(plain.stats_basic(func, "sales", True, lower, upper), nan_ok=True)
+    assert indexed.quantiles("sales", 0.3, True, 20, 260) == plain.quantiles("sales", 0.3, True, 20, 260)
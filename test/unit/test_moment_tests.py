@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import scipy.stats as stats
+
+from statistant.statistantcalc import StatistantCalc
+from statistant.streaming import StreamingStats
+
+
+def streamed(values, chunk_rows: int = 64):
+    # moments of values which are read in chunks, chunks are merged like partitions of a file
+    total = StreamingStats()
+    for start in range(0, len(values), chunk_rows):
+        chunk = StreamingStats()
+        chunk.update(values[start:start + chunk_rows])
+        total.merge(chunk)
+    return total
+
+
+@pytest.mark.parametrize("popmean", [0.0, 0.5, 3.0])
+def test_one_sample_matches_scipy(numbers, popmean):
+    calc = StatistantCalc(numbers)
+    expected = stats.ttest_1samp(numbers["score"], popmean)
+    for moments in (calc.moments("score"), streamed(numbers["score"])):
+        tscore, pval = StatistantCalc.ttest_from_moments(moments, popmean)
+        assert tscore == pytest.approx(expected.statistic, rel=1e-9)
+        assert pval == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+def test_nan_values_are_omitted(numbers):
+    calc = StatistantCalc(numbers)
+    expected = stats.ttest_1samp(numbers["sales"], 100.0, nan_policy="omit")
+    tscore, pval = StatistantCalc.ttest_from_moments(calc.moments("sales"), 100.0)
+    assert tscore == pytest.approx(expected.statistic, rel=1e-9)
+    assert pval == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+def test_paired_matches_scipy(numbers):
+    # rows in which one of both values is NaN are omitted
+    calc = StatistantCalc(numbers)
+    valid = numbers[["sales", "costs"]].dropna()
+    expected = stats.ttest_rel(valid["sales"], valid["costs"])
+    tscore, pval = StatistantCalc.ttest_from_moments(calc.moments(("sales", "costs")))
+    assert tscore == pytest.approx(expected.statistic, rel=1e-9)
+    assert pval == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+def test_welch_from_moments_matches_scipy(numbers):
+    calc = StatistantCalc(numbers)
+    moments1, moments2 = calc.moments("sales"), calc.moments("costs")
+    expected = stats.ttest_ind(numbers["sales"], numbers["costs"], equal_var=False, nan_policy="omit")
+    tscore, pval = stats.ttest_ind_from_stats(moments1.mean, np.sqrt(moments1.variance), moments1.count,
+                                              moments2.mean, np.sqrt(moments2.variance), moments2.count,
+                                              equal_var=False)
+    assert tscore == pytest.approx(expected.statistic, rel=1e-9)
+    assert pval == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+def test_persisted_moments_give_the_same_test(numbers, tmp_path):
+    moments = streamed(numbers["costs"])
+    path = str(tmp_path / "costs.moments.npz")
+    moments.save(path, b"version")
+    assert StreamingStats.load(path, b"other version") is None
+    loaded = StreamingStats.load(path, b"version")
+    assert StatistantCalc.ttest_from_moments(loaded, 100.0) == StatistantCalc.ttest_from_moments(moments, 100.0)
+
+
+def test_less_than_two_values():
+    moments = StreamingStats()
+    moments.update(np.array([1.0, np.nan]))
+    assert np.isnan(StatistantCalc.ttest_from_moments(moments)).all()
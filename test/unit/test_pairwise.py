@@ -0,0 +1,72 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as stats
+from statsmodels.stats.multitest import multipletests
+
+from statistant.pairwise import chi_squared_pairs, correct, paired_pairs, welch_pairs
+
+numerical = ["sales", "costs", "units", "score"]
+
+
+def test_welch_pairs_match_scipy(numbers):
+    results = welch_pairs(numbers[numerical])
+    assert list(zip(results["column1"], results["column2"])) == list(combinations(numerical, 2))
+    for row in results.itertuples():
+        expected = stats.ttest_ind(numbers[row.column1], numbers[row.column2], equal_var=False, nan_policy="omit")
+        assert row.statistic == pytest.approx(expected.statistic, rel=1e-9)
+        assert row.pvalue == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+def test_paired_pairs_match_scipy(numbers):
+    results = paired_pairs(numbers[numerical])
+    assert list(zip(results["column1"], results["column2"])) == list(combinations(numerical, 2))
+    for row in results.itertuples():
+        valid = numbers[[row.column1, row.column2]].dropna()
+        expected = stats.ttest_rel(valid[row.column1], valid[row.column2])
+        assert row.statistic == pytest.approx(expected.statistic, rel=1e-9)
+        assert row.pvalue == pytest.approx(expected.pvalue, rel=1e-9)
+
+
+@pytest.fixture
+def categories():
+    rng = np.random.default_rng(3)
+    n = 400
+    color = rng.choice(["red", "green", "blue"], n)
+    df = pd.DataFrame({
+        "color": color,
+        # depends on color
+        "shade": np.where(rng.random(n) < 0.6, np.char.add(color, "ish"), rng.choice(["light", "dark"], n)),
+        "flag": rng.choice(["yes", "no"], n),
+        "size": rng.choice(["s", "m", "l", "xl"], n),
+    })
+    df.loc[rng.choice(n, 30, replace=False), "flag"] = None
+    return df
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_chi_squared_pairs_match_scipy(categories, max_workers):
+    results = chi_squared_pairs(categories, max_workers=max_workers)
+    assert list(zip(results["column1"], results["column2"])) == list(combinations(categories.columns, 2))
+    for row in results.itertuples():
+        # crosstab drops rows with NaN values like the contingency tables
+        chi, pval, dof, expected = stats.chi2_contingency(pd.crosstab(categories[row.column1],
+                                                                      categories[row.column2]))
+        assert row.statistic == pytest.approx(chi, rel=1e-9)
+        assert row.pvalue == pytest.approx(pval, rel=1e-9)
+
+
+def test_chi_squared_pairs_of_constant_column(categories):
+    results = chi_squared_pairs(categories.assign(color="red")[["color", "size"]], max_workers=1)
+    assert np.isnan(results["statistic"]).all() and np.isnan(results["pvalue"]).all()
+
+
+@pytest.mark.parametrize("method, statsmodels_method", [("holm", "holm"), ("bh", "fdr_bh")])
+def test_correct_matches_statsmodels(method, statsmodels_method):
+    pvalues = np.array([0.001, 0.04, np.nan, 0.03, 0.5, 0.012, np.nan, 0.2])
+    adjusted = correct(pvalues, method)
+    valid = ~np.isnan(pvalues)
+    np.testing.assert_allclose(adjusted[valid], multipletests(pvalues[valid], method=statsmodels_method)[1])
+    assert np.isnan(adjusted[~valid]).all()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from statistant.columnstats import PrefixIndex
+from statistant.statistantcalc import StatistantCalc
+
+# aggregate of pandas per function of the prefix index
+pandas_functions = {"sum": "sum", "average": "mean", "variance": "var", "standard deviation": "std"}
+
+
+def intervals(n: int, count: int = 200, seed: int = 0):
+    # random (start, stop) intervals, including empty and single rows
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, n, count)
+    stops = np.minimum(starts + rng.integers(0, n // 4, count), n)
+    return list(zip(starts, stops)) + [(0, n), (3, 3), (5, 6)]
+
+
+@pytest.mark.parametrize("func", PrefixIndex.functions)
+def test_intervals_match_pandas(numbers, func):
+    values = numbers["sales"]
+    index = PrefixIndex(values)
+    for start, stop in intervals(len(values)):
+        expected = getattr(values.iloc[start:stop], pandas_functions[func])()
+        np.testing.assert_allclose(index.result(func, start, stop), expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("func", PrefixIndex.functions)
+def test_large_offset_does_not_cancel(func):
+    values = pd.Series(1e9 + np.random.default_rng(1).normal(0, 1, 1000))
+    index = PrefixIndex(values)
+    for start, stop in intervals(len(values)):
+        expected = getattr(values.iloc[start:stop], pandas_functions[func])()
+        np.testing.assert_allclose(index.result(func, start, stop), expected, rtol=1e-9)
+
+
+def test_interval_without_values():
+    index = PrefixIndex([1.0, np.nan, np.nan, 4.0])
+    assert index.result("sum", 1, 3) == 0.0
+    assert np.isnan(index.result("average", 1, 3))
+    assert np.isnan(index.result("variance", 0, 2))
+
+
+@pytest.mark.parametrize("func", PrefixIndex.functions)
+def test_calculator_answers_like_without_index(numbers, func):
+    indexed = StatistantCalc(numbers, prefix_index=True)
+    plain = StatistantCalc(numbers)
+    for lower, upper in [(1, 500), (2, 40), (17, 17), (100, 321)]:
+        assert indexed.stats_basic(func, "costs", True, lower, upper) == \
+            pytest.approx(plain.stats_basic(func, "costs", True, lower, upper), abs=1e-9, nan_ok=True)
@@ -0,0 +1,64 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from statistant.resampling import Resampler
+
+
+def resampler(max_workers: int, **attributes):
+    # resampler with small batches, so the resamples are spread over several batches and processes
+    resampler = Resampler(3000, seed=7, max_workers=max_workers)
+    resampler.memory_bytes = 64 * 1024
+    for name, value in attributes.items():
+        setattr(resampler, name, value)
+    return resampler
+
+
+@pytest.mark.parametrize("exact_rows", [Resampler.exact_rows, 100])
+def test_bootstrap_is_reproducible_across_processes(numbers, exact_rows):
+    results = [resampler(max_workers, exact_rows=exact_rows).bootstrap_means(numbers["sales"])
+               for max_workers in (1, 2, 3)]
+    assert len(results[0]) == 3000
+    np.testing.assert_array_equal(results[0], results[1])
+    np.testing.assert_array_equal(results[0], results[2])
+    assert not np.array_equal(results[0], Resampler(3000, seed=8, max_workers=1).bootstrap_means(numbers["sales"]))
+
+
+@pytest.mark.parametrize("exact_rows", [Resampler.exact_rows, 100])
+def test_permutation_is_reproducible_across_processes(numbers, exact_rows):
+    results = [resampler(max_workers, exact_rows=exact_rows).permutation_differences(numbers["sales"],
+                                                                                    numbers["costs"])
+               for max_workers in (1, 2)]
+    np.testing.assert_array_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("exact_rows, bins", [(Resampler.exact_rows, Resampler.bins), (100, 64)])
+def test_bootstrap_distribution_of_the_mean(numbers, exact_rows, bins):
+    values = numbers["sales"].dropna()
+    means = resampler(1, exact_rows=exact_rows, bins=bins).bootstrap_means(numbers["sales"])
+    # NaN values are dropped, the means spread like the standard error of the mean
+    assert means.mean() == pytest.approx(values.mean(), rel=0.01)
+    assert means.std() == pytest.approx(values.std(ddof=0) / np.sqrt(len(values)), rel=0.1)
+
+
+@pytest.mark.parametrize("exact_rows, bins", [(Resampler.exact_rows, Resampler.bins), (100, 64)])
+def test_permutation_distribution_of_the_difference(numbers, exact_rows, bins):
+    values1, values2 = numbers["sales"].dropna(), numbers["costs"].dropna()
+    pooled = np.concatenate((values1, values2))
+    differences = resampler(1, exact_rows=exact_rows, bins=bins).permutation_differences(numbers["sales"],
+                                                                                        numbers["costs"])
+    # under random assignment the difference is centered at 0 with the spread of the pooled values
+    spread = pooled.std() * np.sqrt(1 / len(values1) + 1 / len(values2))
+    assert abs(differences.mean()) < 0.1 * spread
+    assert differences.std() == pytest.approx(spread, rel=0.1)
+
+
+def test_permutations_keep_the_pooled_values():
+    values1, values2 = np.array([1.0, 2.0, np.nan, 4.0]), np.array([10.0, 20.0])
+    differences = Resampler(500, max_workers=1).permutation_differences(values1, values2)
+    # every difference belongs to a split of the pooled values into groups of 3 and 2
+    pooled = np.array([1.0, 2.0, 4.0, 10.0, 20.0])
+    sums = np.array([pooled[list(group)].sum() for group in combinations(range(5), 3)])
+    possible = sums / 3 - (pooled.sum() - sums) / 2
+    assert np.isin(np.round(differences, 9), np.round(possible, 9)).all()
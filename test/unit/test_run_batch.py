@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from statistant.statistantcalc import StatistantCalc
+
+
+def test_batch_answers_like_single_queries(numbers):
+    queries = [("average", "sales"), ("sum", "costs", 10, 3), ("quantile", "units", None, None, 0.25),
+               ("top value", "sales", np.int64(400), 20)]
+    results = StatistantCalc(numbers).run_batch(queries)
+    assert results["error"].isna().all()
+    assert results["result"].tolist() == [StatistantCalc(numbers).stats_basic("average", "sales"),
+                                          StatistantCalc(numbers).stats_basic("sum", "costs", True, 10, 3),
+                                          StatistantCalc(numbers).quantiles("units", 0.25),
+                                          StatistantCalc(numbers).stats_basic("top value", "sales", True, 400, 20)]
+
+
+@pytest.mark.parametrize("lower, upper, error", [
+    (1, "5", "ValueError: the rows of an interval must be integers"),
+    ("1", "5", "ValueError: the rows of an interval must be integers"),
+    (2.5, 8, "ValueError: the rows of an interval must be integers"),
+    (3, None, "ValueError: an interval needs a lower and an upper row"),
+])
+def test_invalid_bounds_only_fail_their_query(numbers, lower, upper, error):
+    queries = [("average", "sales"), ("sum", "costs", lower, upper), ("smallest value", "unknown"),
+               ("sum", "costs", 1, 5)]
+    results = StatistantCalc(numbers).run_batch(queries)
+    assert pd.isna(results["error"][0])
+    assert results["error"][1] == error
+    assert results["error"][2].startswith("KeyError")
+    assert pd.isna(results["result"][1])
+    assert results["result"][3] == StatistantCalc(numbers).stats_basic("sum", "costs", True, 1, 5)
+    assert results["lower"][1] == lower
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.formula.api as smf
+
+from statistant.regression import StreamingOLS
+
+
+@pytest.fixture
+def observations():
+    rng = np.random.default_rng(11)
+    n = 1000
+    df = pd.DataFrame({"x1": rng.normal(0, 1, n), "x2": rng.uniform(-5, 5, n), "x3": rng.normal(1e4, 10, n)})
+    df["y"] = 3 + 2 * df["x1"] - 0.5 * df["x2"] + 0.01 * df["x3"] + rng.normal(0, 1, n)
+    df.loc[rng.choice(n, 30, replace=False), "x2"] = np.nan
+    df.loc[rng.choice(n, 30, replace=False), "y"] = np.nan
+    return df
+
+
+def streamed(df, x_cols, chunk_rows: int = 97):
+    # regression of df read in chunks, every second chunk is fitted separately and merged like a partition
+    model, partition = StreamingOLS(x_cols, "y"), StreamingOLS(x_cols, "y")
+    for number, start in enumerate(range(0, len(df), chunk_rows)):
+        chunk = df.iloc[start:start + chunk_rows]
+        (model if number % 2 else partition).update(chunk[x_cols], chunk["y"])
+    model.merge(partition)
+    return model
+
+
+@pytest.mark.parametrize("x_cols", [["x1"], ["x1", "x2"], ["x1", "x2", "x3"]])
+def test_matches_statsmodels(observations, x_cols):
+    model = streamed(observations, x_cols)
+    # formulas drop rows with NaN values
+    expected = smf.ols("y ~ " + " + ".join(x_cols), data=observations).fit()
+
+    assert model.nobs == expected.nobs
+    assert model.exog_names == list(expected.params.index)
+    np.testing.assert_allclose(model.params, expected.params, rtol=1e-8)
+    np.testing.assert_allclose(model.bse, expected.bse, rtol=1e-8)
+    np.testing.assert_allclose(model.pvalues, expected.pvalues, rtol=1e-6, atol=1e-300)
+    np.testing.assert_allclose(model.conf_int(), expected.conf_int(), rtol=1e-8)
+    for attribute in ("rsquared", "rsquared_adj", "fvalue", "f_pvalue", "llf", "aic", "bic", "ssr", "df_resid"):
+        assert getattr(model, attribute) == pytest.approx(getattr(expected, attribute), rel=1e-8), attribute
+
+
+def test_chunk_size_does_not_matter(observations):
+    x_cols = ["x1", "x2", "x3"]
+    np.testing.assert_allclose(streamed(observations, x_cols, 7).params, streamed(observations, x_cols, 1000).params,
+                               rtol=1e-10)
+
+
+def test_empty_chunks_are_skipped(observations):
+    model = StreamingOLS(["x1"], "y")
+    model.update(observations[["x1"]].iloc[:0], observations["y"].iloc[:0])
+    model.merge(StreamingOLS(["x1"], "y"))
+    model.update(observations[["x1"]], observations["y"])
+    expected = smf.ols("y ~ x1", data=observations).fit()
+    np.testing.assert_allclose(model.params, expected.params, rtol=1e-8)
+
+
+def test_summary_lists_the_coefficients(observations):
+    summary = streamed(observations, ["x1", "x2"]).summary().as_text()
+    assert "OLS Regression Results" in summary
+    for name in ("Intercept", "x1", "x2", "R-squared"):
+        assert name in summary